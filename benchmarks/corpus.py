@@ -0,0 +1,47 @@
+"""Marker strings collected from real-world lock files and package metadata."""
+
+MARKERS = [
+    'python_version >= "3.8"',
+    'python_version < "3.11"',
+    'python_full_version >= "3.6.2"',
+    'python_version >= "3.7" and python_version < "4.0"',
+    'python_full_version >= "3.8.1" and python_version < "4.0"',
+    'sys_platform == "win32"',
+    'sys_platform != "win32"',
+    'platform_system == "Windows"',
+    'platform_system != "Windows"',
+    'os_name == "nt"',
+    'implementation_name == "cpython"',
+    'platform_python_implementation == "CPython"',
+    'platform_python_implementation != "PyPy"',
+    'platform_machine == "x86_64" or platform_machine == "AMD64"',
+    'platform_machine == "aarch64" or platform_machine == "arm64"',
+    'sys_platform == "darwin" and platform_machine == "arm64"',
+    'sys_platform == "linux" and platform_machine == "x86_64"',
+    'python_version < "3.8" and sys_platform != "win32"',
+    'python_version >= "3.9" and sys_platform != "win32"',
+    'python_version < "3.10" and platform_python_implementation == "CPython"',
+    'extra == "dev"',
+    'extra == "test" or extra == "testing"',
+    'python_version >= "3.8" and extra == "docs"',
+    'extra == "all" or extra == "postgres"',
+    'python_version < "3.9" and extra == "test"',
+    'python_version >= "3.7" and (extra == "socks" or extra == "all")',
+    "platform_machine == 'x86_64' and platform_system == 'Linux' "
+    "and python_version < '3.13'",
+    'sys_platform == "win32" and python_version >= "3.8" and python_version < "3.13"',
+    'python_version >= "3.6" and python_version < "3.8" or python_version >= "3.10"',
+    '(sys_platform == "darwin" or sys_platform == "linux") and python_version >= "3.9"',
+    'python_full_version >= "3.9.0" and python_full_version < "3.9.7" '
+    'or python_full_version > "3.9.7"',
+    'platform_system == "Linux" and platform_machine == "x86_64" '
+    'and python_version >= "3.8" and python_version < "3.12"',
+    'implementation_name != "pypy" and python_version < "3.12"',
+    'os_name != "nt" and platform_system != "Darwin"',
+    '"dev" in dependency_groups',
+    '"test" in dependency_groups or "dev" in dependency_groups',
+    '"docs" in extras and python_version >= "3.10"',
+    'python_version == "3.8" or python_version == "3.9" or python_version == "3.10"',
+    'platform_machine != "ppc64le" and platform_machine != "s390x"',
+    'python_version ~= "3.10"',
+]
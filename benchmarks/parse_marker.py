@@ -0,0 +1,58 @@
+"""Compare the native marker parser with the packaging-based parsing path.
+
+Run with ``python benchmarks/parse_marker.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from corpus import MARKERS
+from packaging.markers import Marker, Variable
+
+from dep_logic.markers import AnyMarker, BaseMarker, MarkerExpression, MarkerUnion
+from dep_logic.markers.parser import parse_marker_string
+from dep_logic.utils import get_reflect_op
+
+
+def _build_markers(markers) -> BaseMarker:
+    # The conversion used before the native parser, kept here for comparison.
+    if isinstance(markers, tuple):
+        if isinstance(markers[0], Variable):
+            name, op, value = map(str, markers)
+            return MarkerExpression(name, op, value)
+        return MarkerExpression(
+            str(markers[2]), get_reflect_op(str(markers[1])), str(markers[0]), True
+        )
+    or_groups: list[BaseMarker] = [AnyMarker()]
+    for item in markers:
+        if item == "or":
+            or_groups.append(AnyMarker())
+        elif item != "and":
+            or_groups[-1] &= _build_markers(item)
+    return MarkerUnion.of(*or_groups)
+
+
+def packaging_path() -> None:
+    for marker in MARKERS:
+        _build_markers(Marker(marker)._markers)
+
+
+def native_path() -> None:
+    for marker in MARKERS:
+        parse_marker_string(marker)
+
+
+def main() -> None:
+    # Warm up the shared merge caches so that only the parsing is measured
+    packaging_path()
+    native_path()
+    number = 200
+    for name, func in [("packaging", packaging_path), ("native", native_path)]:
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        per_marker = best / number / len(MARKERS) * 1e6
+        print(f"{name:>10}: {per_marker:.2f} us/marker")
+
+
+if __name__ == "__main__":
+    main()
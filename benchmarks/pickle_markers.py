@@ -0,0 +1,52 @@
+"""Measure the pickled size and round-trip time of markers, specifiers and
+environment specs, as sent to the workers of a process pool.
+
+Run with ``python benchmarks/pickle_markers.py``.
+"""
+
+from __future__ import annotations
+
+import pickle
+import timeit
+
+from corpus import MARKERS
+
+from dep_logic.markers import parse_marker
+from dep_logic.tags import EnvSpec
+
+
+def _build_objects() -> dict[str, list[object]]:
+    markers = [parse_marker(marker) for marker in MARKERS]
+    for marker in markers:
+        # Fill the lazily computed state, as a resolver would
+        str(marker)
+        marker.python_range()
+    specifiers = [marker.python_range() for marker in markers]
+    env_specs = [
+        EnvSpec.from_spec(">=3.8", platform, implementation)
+        for platform in ("linux", "windows", "macos", "alpine")
+        for implementation in ("cpython", "pypy")
+    ]
+    for env_spec in env_specs:
+        assert env_spec.platform is not None
+        env_spec.platform.compatible_tags
+    return {"markers": markers, "specifiers": specifiers, "env specs": env_specs}
+
+
+def main() -> None:
+    number = 50
+    for name, objects in _build_objects().items():
+        payload = pickle.dumps(objects)
+
+        def round_trip(objects: list[object] = objects) -> None:
+            pickle.loads(pickle.dumps(objects))
+
+        best = min(timeit.repeat(round_trip, number=number, repeat=5)) / number
+        print(
+            f"{name:>10}: {len(payload):>7} bytes, "
+            f"{best / len(objects) * 1e6:.2f} us/object round trip"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from dep_logic.markers.any import AnyMarker
+from dep_logic.markers.base import BaseMarker
+from dep_logic.markers.empty import EmptyMarker
+from dep_logic.markers.lazy import LazyMarker
+from dep_logic.markers.multi import MultiMarker
+from dep_logic.markers.single import SingleMarker
+from dep_logic.markers.union import MarkerUnion
+from dep_logic.utils import dnf
+
+
+def _implies(marker: BaseMarker, other: BaseMarker) -> bool:
+    if marker == other:
+        return True
+    if (
+        isinstance(marker, SingleMarker)
+        and isinstance(other, SingleMarker)
+        and marker.name == other.name
+    ):
+        return marker & other == marker
+    return False
+
+
+class MarkerAccumulator:
+    """Build the union of markers added one at a time.
+
+    The union is kept as a list of conjunctions. A new marker is split into
+    its conjunctions, and each of them is dropped if an existing one already
+    covers it, or replaces the existing ones it covers. The accumulated marker
+    is only built when `marker` is accessed, instead of normalizing the whole
+    union on each addition.
+
+    Args:
+        markers: The initial markers of the union.
+    """
+
+    __slots__ = ("_marker", "_terms")
+
+    def __init__(self, *markers: BaseMarker) -> None:
+        # Each conjunction is stored with the set of its markers
+        self._terms: list[tuple[BaseMarker, frozenset[BaseMarker]]] = []
+        self._marker: BaseMarker | None = EmptyMarker()
+        for marker in markers:
+            self.add(marker)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    @property
+    def terms(self) -> tuple[BaseMarker, ...]:
+        """The conjunctions of the union."""
+        return tuple(term for term, _ in self._terms)
+
+    def is_any(self) -> bool:
+        return len(self._terms) == 1 and not self._terms[0][1]
+
+    def add(self, marker: BaseMarker) -> bool:
+        """Add a marker to the union.
+
+        Returns:
+            True if the union was changed, False if the marker was already
+            covered by it.
+        """
+        if isinstance(marker, LazyMarker):
+            marker = marker.resolve()
+        if self.is_any() or marker.is_empty():
+            return False
+        normalized = dnf(marker)
+        changed = False
+        for term in (
+            normalized.markers if isinstance(normalized, MarkerUnion) else (normalized,)
+        ):
+            changed |= self._add_term(term)
+        if changed:
+            self._marker = None
+        return changed
+
+    def _add_term(self, term: BaseMarker) -> bool:
+        if term.is_any():
+            self._terms = [(term, frozenset())]
+            return True
+        parts = frozenset(term.markers if isinstance(term, MultiMarker) else (term,))
+        for _, existing in self._terms:
+            # The existing conjunction covers the new one if each of its
+            # markers is implied by a marker of the new one.
+            if all(any(_implies(p, e) for p in parts) for e in existing):
+                return False
+        self._terms = [
+            (other, existing)
+            for other, existing in self._terms
+            if not all(any(_implies(e, p) for e in existing) for p in parts)
+        ]
+        self._terms.append((term, parts))
+        return True
+
+    @property
+    def marker(self) -> BaseMarker:
+        """The accumulated union."""
+        if self._marker is None:
+            if self.is_any():
+                self._marker = AnyMarker()
+            else:
+                self._marker = MarkerUnion.of(*self.terms)
+        return self._marker
+
+    def __repr__(self) -> str:
+        return f"<MarkerAccumulator {self.marker}>"
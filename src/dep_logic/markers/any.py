@@ -24,6 +24,9 @@ class AnyMarker(BaseMarker):
     ):
         return True
 
+    def _evaluate(self, environment: dict[str, str | set[str]]) -> bool:
+        return True
+
     def without_extras(self) -> BaseMarker:
         return self
 
@@ -1,9 +1,64 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal, cast
+
+from packaging.markers import default_environment
+
+from dep_logic.utils import normalize_name
+
+if TYPE_CHECKING:
+    from dep_logic.markers.extras import ExtrasTerm
+    from dep_logic.specifiers import BaseSpecifier
 
 EvaluationContext = Literal["lock_file", "metadata", "requirement"]
+MARKERS_ALLOWING_SET = {"extras", "dependency_groups"}
+
+
+class InvalidMarker(ValueError):
+    """
+    An invalid marker was found, users should refer to PEP 508.
+    """
+
+
+def prepare_environment(
+    environment: dict[str, str | set[str]] | None = None,
+    context: EvaluationContext = "metadata",
+) -> dict[str, str | set[str]]:
+    """Fill the given environment with the default values of the current
+    interpreter and the given evaluation context.
+
+    The extra names in the "extra", "extras" and "dependency_groups" values
+    are normalized here, so that it is done only once per evaluation.
+    """
+    current_environment = cast("dict[str, str|set[str]]", default_environment())
+    if context == "metadata":
+        current_environment["extra"] = ""
+    elif context == "lock_file":
+        current_environment.update(extras=set(), dependency_groups=set())
+    if environment:
+        current_environment.update(environment)
+    if "extra" in current_environment:
+        # Support batch comparison for "extra" markers
+        extra = current_environment["extra"]
+        if extra is None:
+            extra = ""
+        if isinstance(extra, str):
+            extra = {extra}
+        current_environment["extra"] = cast(
+            "set[str]", frozenset(normalize_name(v) for v in extra)
+        )
+    for name in MARKERS_ALLOWING_SET:
+        if name not in current_environment:
+            continue
+        value = current_environment[name]
+        if isinstance(value, str):
+            current_environment[name] = normalize_name(value)
+        else:
+            current_environment[name] = cast(
+                "set[str]", frozenset(normalize_name(v) for v in value)
+            )
+    return current_environment
 
 
 class BaseMarker(metaclass=ABCMeta):
@@ -31,7 +86,6 @@ class BaseMarker(metaclass=ABCMeta):
         """Returns True if the marker disallows any environment."""
         return False
 
-    @abstractmethod
     def evaluate(
         self,
         environment: dict[str, str | set[str]] | None = None,
@@ -44,7 +98,76 @@ class BaseMarker(metaclass=ABCMeta):
             context: The context in which the evaluation is performed,
                 can be "lock_file", "metadata", or "requirement".
         """
-        raise NotImplementedError
+        return self._evaluate(prepare_environment(environment, context))
+
+    def _evaluate(self, environment: dict[str, str | set[str]]) -> bool:
+        """Evaluates the marker against an environment returned by
+        `prepare_environment`.
+
+        Subclasses should override this method, the default calls `evaluate`
+        for the subclasses that only override it.
+        """
+        if type(self).evaluate is BaseMarker.evaluate:
+            raise NotImplementedError
+        return self.evaluate(environment)
+
+    def extras_requirement(
+        self,
+        environment: dict[str, str | set[str]] | None = None,
+        context: EvaluationContext = "metadata",
+    ) -> tuple[ExtrasTerm, ...]:
+        """Returns the selections of extras that enable the marker, given the
+        other variables in the environment.
+
+        The result is a DNF over the extra names: the marker is enabled by a
+        selection of extras if any of the returned terms matches it. Only the
+        minimal terms are kept. An empty tuple means the marker is never enabled,
+        and a single empty term means it is enabled without any extra.
+
+        Args:
+            environment: The environment to evaluate other markers against.
+            context: The context in which the evaluation is performed,
+                can be "lock_file", "metadata", or "requirement".
+
+        Raises:
+            UndefinedComparison: if an extra is compared with another operator
+                than ``==`` or ``!=``.
+        """
+        from dep_logic.markers.extras import extras_requirement
+
+        return extras_requirement(self, environment, context)
+
+    def python_range(self) -> BaseSpecifier:
+        """Returns the range of python versions allowed by the marker.
+
+        The range is over ``python_full_version``, and ``python_version``
+        markers are converted to the full versions they match. Markers on other
+        variables don't restrict the range, so it may be larger than the exact
+        set of python versions allowed by the marker.
+        """
+        from dep_logic.specifiers import RangeSpecifier
+
+        return RangeSpecifier()
+
+    def evaluate_python_range(self, python: BaseSpecifier) -> bool | None:
+        """Evaluates the marker for a whole range of python versions.
+
+        Args:
+            python: The range of ``python_full_version`` values.
+
+        Returns:
+            True if the marker is true for all python versions in the range,
+            False if it is false for all of them, and None if the result
+            depends on the python version or on other variables.
+        """
+        from dep_logic.markers.python import python_bounds
+
+        lower, upper = python_bounds(self)
+        if (python & upper).is_empty():
+            return False
+        if (python & ~lower).is_empty():
+            return True
+        return None
 
     @abstractmethod
     def without_extras(self) -> BaseMarker:
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import typing as t
+
+from dep_logic.markers.any import AnyMarker
+from dep_logic.markers.base import (
+    MARKERS_ALLOWING_SET,
+    BaseMarker,
+    EvaluationContext,
+    prepare_environment,
+)
+from dep_logic.markers.empty import EmptyMarker
+from dep_logic.markers.lazy import LazyMarker, ParseTree
+from dep_logic.markers.multi import MultiMarker
+from dep_logic.markers.single import MarkerExpression, SingleMarker
+from dep_logic.markers.union import MarkerUnion
+
+# Relative evaluation costs of the leaf markers
+_VERSION_COMPARISON_COST = 10
+_NORMALIZED_COMPARISON_COST = 3
+_STRING_COMPARISON_COST = 1
+
+
+class _Node:
+    __slots__ = ("calls", "cost", "hits", "index")
+
+    def __init__(self, cost: int, index: int) -> None:
+        self.cost = cost
+        self.index = index
+        self.calls = 0
+        self.hits = 0
+
+    def evaluate(self, environment: dict[str, str | set[str]]) -> bool:
+        raise NotImplementedError
+
+    def evaluate_declared(self, environment: dict[str, str | set[str]]) -> bool:
+        """Evaluate in declaration order without recording statistics."""
+        raise NotImplementedError
+
+    def probability(self) -> float:
+        """The observed probability of evaluating to True, with Laplace smoothing."""
+        return (self.hits + 1) / (self.calls + 2)
+
+
+class _Constant(_Node):
+    __slots__ = ("value",)
+
+    def __init__(self, value: bool, index: int) -> None:
+        super().__init__(0, index)
+        self.value = value
+
+    def evaluate(self, environment: dict[str, str | set[str]]) -> bool:
+        return self.value
+
+    def evaluate_declared(self, environment: dict[str, str | set[str]]) -> bool:
+        return self.value
+
+
+class _Leaf(_Node):
+    __slots__ = ("marker",)
+
+    def __init__(self, marker: SingleMarker, index: int) -> None:
+        super().__init__(_leaf_cost(marker), index)
+        self.marker = marker
+
+    def evaluate(self, environment: dict[str, str | set[str]]) -> bool:
+        result = self.marker._evaluate(environment)
+        self.calls += 1
+        self.hits += result
+        return result
+
+    def evaluate_declared(self, environment: dict[str, str | set[str]]) -> bool:
+        return self.marker._evaluate(environment)
+
+
+class _Group(_Node):
+    __slots__ = ("children", "conjunction", "declared", "interval")
+
+    def __init__(
+        self, conjunction: bool, children: t.Sequence[_Node], index: int, interval: int
+    ) -> None:
+        super().__init__(sum(child.cost for child in children), index)
+        self.conjunction = conjunction
+        self.declared = tuple(children)
+        self.children = self.declared
+        self.interval = interval
+
+    def evaluate(self, environment: dict[str, str | set[str]]) -> bool:
+        children = self.children
+        # A conjunction stops at the first False, a disjunction at the first True
+        result = self.conjunction
+        try:
+            for child in children:
+                if child.evaluate(environment) != self.conjunction:
+                    result = not self.conjunction
+                    break
+        except Exception:
+            if children == self.declared:
+                raise
+            # A child moved to the front may fail where the declaration order
+            # short-circuits before reaching it. The children that already ran
+            # have recorded their statistics.
+            result = self.evaluate_declared(environment)
+        self.calls += 1
+        self.hits += result
+        if self.calls % self.interval == 0:
+            self.reorder()
+        return result
+
+    def evaluate_declared(self, environment: dict[str, str | set[str]]) -> bool:
+        for child in self.declared:
+            if child.evaluate_declared(environment) != self.conjunction:
+                return not self.conjunction
+        return self.conjunction
+
+    def reorder(self) -> None:
+        """Sort the children so that the cheapest short-circuit comes first.
+
+        The expected cost of a child before short-circuiting is its cost divided
+        by the probability that it decides the group's result. Ties keep the
+        declaration order so that the order only depends on the statistics.
+        """
+        if self.conjunction:
+
+            def key(node: _Node) -> tuple[float, int]:
+                return node.cost / (1 - node.probability()), node.index
+
+        else:
+
+            def key(node: _Node) -> tuple[float, int]:
+                return node.cost / node.probability(), node.index
+
+        # Replace the children instead of sorting them in place, other threads
+        # may be iterating them
+        self.children = tuple(sorted(self.children, key=key))
+
+
+def _leaf_cost(marker: SingleMarker) -> int:
+    if not isinstance(marker, MarkerExpression):
+        return _STRING_COMPARISON_COST
+    if marker.name in marker._VERSION_LIKE_MARKER_NAME:
+        return _VERSION_COMPARISON_COST
+    if marker.name == "extra" or marker.name in MARKERS_ALLOWING_SET:
+        return _NORMALIZED_COMPARISON_COST
+    # Other markers may still be compared as versions, e.g. implementation_version
+    return _STRING_COMPARISON_COST
+
+
+class CompiledMarker:
+    """A marker prepared for repeated evaluations.
+
+    The children of each ``and``/``or`` group are reordered by their estimated
+    cost and the selectivity observed in previous calls, to make
+    short-circuiting happen as early as possible. The statistics are only
+    applied every ``interval`` evaluations of a group, and reordering never
+    changes the result of the evaluation.
+
+    Args:
+        marker: The marker to compile.
+        interval: The number of evaluations between two reorderings.
+    """
+
+    __slots__ = ("_root", "marker")
+
+    def __init__(self, marker: BaseMarker, interval: int = 64) -> None:
+        self.marker = marker
+        self._root = self._compile(marker, 0, interval)
+
+    def _compile(
+        self, marker: BaseMarker | ParseTree, index: int, interval: int
+    ) -> _Node:
+        if isinstance(marker, LazyMarker):
+            return self._compile(marker._tree, index, interval)
+        if isinstance(marker, SingleMarker):
+            return _Leaf(marker, index)
+        if isinstance(marker, (MultiMarker, MarkerUnion)):
+            conjunction = isinstance(marker, MultiMarker)
+            children: t.Sequence[BaseMarker | ParseTree] = marker.markers
+        elif isinstance(marker, tuple):
+            conjunction = marker[0] == "and"
+            children = marker[1]
+        elif isinstance(marker, (AnyMarker, EmptyMarker)):
+            return _Constant(marker.is_any(), index)
+        else:
+            raise TypeError(f"Unsupported marker type: {type(marker).__name__}")
+        return _Group(
+            conjunction,
+            [self._compile(child, i, interval) for i, child in enumerate(children)],
+            index,
+            interval,
+        )
+
+    def evaluate(
+        self,
+        environment: dict[str, str | set[str]] | None = None,
+        context: EvaluationContext = "metadata",
+    ) -> bool:
+        """Evaluates the marker against the given environment.
+
+        See `BaseMarker.evaluate` for the arguments.
+        """
+        return self._root.evaluate(prepare_environment(environment, context))
+
+    def __repr__(self) -> str:
+        return f"<CompiledMarker {self.marker}>"
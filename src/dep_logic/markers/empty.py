@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from dep_logic.markers.base import BaseMarker, EvaluationContext
 
+if TYPE_CHECKING:
+    from dep_logic.specifiers import BaseSpecifier
+
 
 class EmptyMarker(BaseMarker):
     def __and__(self, other: BaseMarker) -> BaseMarker:
@@ -24,6 +29,14 @@ class EmptyMarker(BaseMarker):
     ) -> bool:
         return False
 
+    def _evaluate(self, environment: dict[str, str | set[str]]) -> bool:
+        return False
+
+    def python_range(self) -> BaseSpecifier:
+        from dep_logic.specifiers import EmptySpecifier
+
+        return EmptySpecifier()
+
     def without_extras(self) -> BaseMarker:
         return self
 
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import typing as t
+
+from dep_logic.markers.any import AnyMarker
+from dep_logic.markers.base import BaseMarker, EvaluationContext, prepare_environment
+from dep_logic.markers.empty import EmptyMarker
+from dep_logic.markers.lazy import LazyMarker
+from dep_logic.markers.multi import MultiMarker
+from dep_logic.markers.single import (
+    MarkerExpression,
+    SingleMarker,
+    UndefinedComparison,
+)
+from dep_logic.markers.union import MarkerUnion
+from dep_logic.utils import dnf, normalize_name
+
+
+class ExtrasTerm(t.NamedTuple):
+    """A conjunction of extra conditions: all ``required`` extras are selected
+    and none of the ``excluded`` ones.
+    """
+
+    required: frozenset[str]
+    excluded: frozenset[str]
+
+    def matches(self, extras: t.Iterable[str]) -> bool:
+        """Return True if the given selection of extras satisfies this term."""
+        selected = {normalize_name(extra) for extra in extras}
+        return self.required <= selected and self.excluded.isdisjoint(selected)
+
+    def subsumes(self, other: ExtrasTerm) -> bool:
+        """Return True if every selection matching ``other`` matches this term."""
+        return self.required <= other.required and self.excluded <= other.excluded
+
+
+def partial_evaluate(
+    marker: BaseMarker,
+    environment: dict[str, str | set[str]],
+    keep: t.Container[str],
+) -> BaseMarker:
+    """Replace all markers whose name is not in ``keep`` with their values
+    in the prepared environment, and simplify the result.
+    """
+    if isinstance(marker, LazyMarker):
+        marker = marker.resolve()
+    if isinstance(marker, MultiMarker):
+        return MultiMarker.of(
+            *(partial_evaluate(m, environment, keep) for m in marker.markers)
+        )
+    if isinstance(marker, MarkerUnion):
+        return MarkerUnion.of(
+            *(partial_evaluate(m, environment, keep) for m in marker.markers)
+        )
+    if isinstance(marker, SingleMarker) and marker.name not in keep:
+        return AnyMarker() if marker._evaluate(environment) else EmptyMarker()
+    return marker
+
+
+def _to_term(marker: BaseMarker) -> ExtrasTerm:
+    atoms = marker.markers if isinstance(marker, MultiMarker) else (marker,)
+    required: set[str] = set()
+    excluded: set[str] = set()
+    for atom in atoms:
+        assert isinstance(atom, MarkerExpression) and atom.name == "extra"
+        if atom.op == "==":
+            required.add(atom._normalized_value)
+        elif atom.op == "!=":
+            excluded.add(atom._normalized_value)
+        else:
+            raise UndefinedComparison(
+                f"Undefined comparison {atom}, only == and != are supported for extras"
+            )
+    return ExtrasTerm(frozenset(required), frozenset(excluded))
+
+
+def extras_requirement(
+    marker: BaseMarker,
+    environment: dict[str, str | set[str]] | None = None,
+    context: EvaluationContext = "metadata",
+) -> tuple[ExtrasTerm, ...]:
+    """Project the marker on the "extra" variable, see
+    `BaseMarker.extras_requirement`.
+    """
+    prepared = prepare_environment(environment, context)
+    projected = dnf(partial_evaluate(marker, prepared, ("extra",)))
+    if projected.is_empty():
+        return ()
+    if projected.is_any():
+        return (ExtrasTerm(frozenset(), frozenset()),)
+    disjuncts = (
+        projected.markers if isinstance(projected, MarkerUnion) else (projected,)
+    )
+    terms = list(dict.fromkeys(_to_term(m) for m in disjuncts))
+    # Only keep the minimal terms
+    return tuple(
+        term
+        for term in terms
+        if not any(other != term and other.subsumes(term) for other in terms)
+    )
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import functools
+import typing as t
+
+from dep_logic.markers.base import MARKERS_ALLOWING_SET, BaseMarker, prepare_environment
+from dep_logic.markers.extras import partial_evaluate
+from dep_logic.markers.multi import MultiMarker
+from dep_logic.markers.single import MarkerExpression, SingleMarker
+from dep_logic.markers.union import MarkerUnion
+from dep_logic.utils import normalize_name
+
+
+class GroupSplit(t.NamedTuple):
+    """The part of a marker that depends on the selected extras and
+    dependency groups, once the environment part has been evaluated.
+
+    ``extras`` and ``dependency_groups`` are the names the group part refers
+    to, or None if it compares the whole set and any name may matter.
+    """
+
+    marker: BaseMarker
+    extras: frozenset[str] | None
+    dependency_groups: frozenset[str] | None
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_names(names: frozenset[str]) -> frozenset[str]:
+    # Bounded, the selections come from the callers and may be unbounded
+    return frozenset(normalize_name(name) for name in names)
+
+
+def _referenced_names(marker: BaseMarker) -> dict[str, set[str] | None]:
+    names: dict[str, set[str] | None] = {name: set() for name in MARKERS_ALLOWING_SET}
+    stack = [marker]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, (MultiMarker, MarkerUnion)):
+            stack.extend(current.markers)
+        elif isinstance(current, SingleMarker) and current.name in names:
+            selected = names[current.name]
+            if isinstance(current, MarkerExpression) and current.reversed:
+                if selected is not None:
+                    selected.add(current._normalized_value)
+            else:
+                # The whole set is compared, not only membership of a name
+                names[current.name] = None
+    return names
+
+
+class GroupSelectionEvaluator:
+    """Evaluate lock file markers against one environment for many selections
+    of extras and dependency groups.
+
+    Each marker is split once into its environment part, which is evaluated
+    against the environment, and its group part. Evaluating a marker for
+    another selection then only evaluates the group part, and the result is
+    shared by all selections that agree on the names the marker refers to.
+
+    Args:
+        environment: The environment to evaluate against, the extras and
+            dependency groups in it are ignored.
+    """
+
+    __slots__ = ("_results", "_splits", "environment")
+
+    def __init__(self, environment: dict[str, str | set[str]] | None = None) -> None:
+        self.environment = prepare_environment(environment, "lock_file")
+        self._splits: dict[BaseMarker, GroupSplit] = {}
+        self._results: dict[
+            tuple[BaseMarker, frozenset[str], frozenset[str]], bool
+        ] = {}
+
+    def split(self, marker: BaseMarker) -> GroupSplit:
+        """Return the group part of the marker in this environment."""
+        try:
+            return self._splits[marker]
+        except KeyError:
+            pass
+        group_part = partial_evaluate(marker, self.environment, MARKERS_ALLOWING_SET)
+        names = _referenced_names(group_part)
+        extras, groups = names["extras"], names["dependency_groups"]
+        result = self._splits[marker] = GroupSplit(
+            group_part,
+            None if extras is None else frozenset(extras),
+            None if groups is None else frozenset(groups),
+        )
+        return result
+
+    def evaluate(
+        self,
+        marker: BaseMarker,
+        extras: t.AbstractSet[str] = frozenset(),
+        dependency_groups: t.AbstractSet[str] = frozenset(),
+    ) -> bool:
+        """Evaluate the marker with the given extras and dependency groups selected."""
+        group_part, extra_names, group_names = self.split(marker)
+        if group_part.is_any():
+            return True
+        if group_part.is_empty():
+            return False
+        selected_extras = _normalize_names(frozenset(extras))
+        selected_groups = _normalize_names(frozenset(dependency_groups))
+        if extra_names is not None:
+            selected_extras &= extra_names
+        if group_names is not None:
+            selected_groups &= group_names
+        key = (group_part, selected_extras, selected_groups)
+        try:
+            return self._results[key]
+        except KeyError:
+            pass
+        result = self._results[key] = group_part._evaluate(
+            {"extras": selected_extras, "dependency_groups": selected_groups}
+        )
+        return result
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import typing as t
+
+from dep_logic.markers.base import BaseMarker
+from dep_logic.markers.parser import MarkerParser, build_and, build_or
+from dep_logic.markers.single import MarkerExpression
+
+if t.TYPE_CHECKING:
+    from dep_logic.specifiers import BaseSpecifier
+
+# A raw parse tree: either a leaf expression or an ("and"|"or", children) pair
+ParseTree = t.Union[MarkerExpression, t.Tuple[str, t.Tuple["ParseTree", ...]]]
+
+
+class RawMarkerParser(MarkerParser):
+    """Parse a marker into a raw tree without any simplification."""
+
+    __slots__ = ()
+
+    def make_and(self, items: list[ParseTree]) -> ParseTree:
+        return items[0] if len(items) == 1 else ("and", tuple(items))
+
+    def make_or(self, items: list[ParseTree]) -> ParseTree:
+        return items[0] if len(items) == 1 else ("or", tuple(items))
+
+
+def _evaluate_tree(tree: ParseTree, environment: dict[str, str | set[str]]) -> bool:
+    if isinstance(tree, MarkerExpression):
+        return tree._evaluate(environment)
+    op, children = tree
+    if op == "and":
+        return all(_evaluate_tree(child, environment) for child in children)
+    return any(_evaluate_tree(child, environment) for child in children)
+
+
+def _build_tree(tree: ParseTree) -> BaseMarker:
+    if isinstance(tree, MarkerExpression):
+        return tree
+    op, children = tree
+    build = build_and if op == "and" else build_or
+    return build(_build_tree(child) for child in children)
+
+
+class LazyMarker(BaseMarker):
+    """A marker that is evaluated from its raw parse tree.
+
+    The simplified marker is only built when it is needed by the logic
+    operations, comparison or string conversion. Evaluating a lazy marker
+    gives the same result as evaluating the simplified one.
+    """
+
+    __slots__ = ("_marker", "_tree", "source")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._tree: ParseTree = RawMarkerParser(source).parse()
+        self._marker: BaseMarker | None = None
+
+    def resolve(self) -> BaseMarker:
+        """Return the fully simplified marker, building it on first access."""
+        if self._marker is None:
+            self._marker = _build_tree(self._tree)
+        return self._marker
+
+    @property
+    def complexity(self) -> tuple[int, ...]:
+        return self.resolve().complexity
+
+    def __and__(self, other: t.Any) -> BaseMarker:
+        if isinstance(other, LazyMarker):
+            other = other.resolve()
+        return self.resolve() & other
+
+    def __rand__(self, other: t.Any) -> BaseMarker:
+        return other & self.resolve()
+
+    def __or__(self, other: t.Any) -> BaseMarker:
+        if isinstance(other, LazyMarker):
+            other = other.resolve()
+        return self.resolve() | other
+
+    def __ror__(self, other: t.Any) -> BaseMarker:
+        return other | self.resolve()
+
+    def is_any(self) -> bool:
+        return self.resolve().is_any()
+
+    def is_empty(self) -> bool:
+        return self.resolve().is_empty()
+
+    def _evaluate(self, environment: dict[str, str | set[str]]) -> bool:
+        return _evaluate_tree(self._tree, environment)
+
+    def python_range(self) -> BaseSpecifier:
+        return self.resolve().python_range()
+
+    def without_extras(self) -> BaseMarker:
+        return self.resolve().without_extras()
+
+    def exclude(self, marker_name: str) -> BaseMarker:
+        return self.resolve().exclude(marker_name)
+
+    def only(self, *marker_names: str) -> BaseMarker:
+        return self.resolve().only(*marker_names)
+
+    def __str__(self) -> str:
+        return str(self.resolve())
+
+    def __repr__(self) -> str:
+        return f"<LazyMarker {self.source}>"
+
+    def __hash__(self) -> int:
+        return hash(self.resolve())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyMarker):
+            other = other.resolve()
+        if not isinstance(other, BaseMarker):
+            return NotImplemented
+        return self.resolve() == other
+
+
+def resolve_lazy(markers: t.Iterable[BaseMarker]) -> list[BaseMarker]:
+    """Replace the lazy markers with their simplified forms."""
+    return [m.resolve() if isinstance(m, LazyMarker) else m for m in markers]
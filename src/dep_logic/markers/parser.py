@@ -0,0 +1,212 @@
+"""A single-pass PEP 508 environment marker parser.
+
+The grammar follows the marker part of PEP 508, with the variables added by
+PEP 685 (``extras``) and PEP 735 (``dependency_groups``)::
+
+    marker      = marker_and ('or' marker_and)*
+    marker_and  = marker_atom ('and' marker_atom)*
+    marker_atom = '(' marker ')' | marker_item
+    marker_item = marker_var marker_op marker_var
+    marker_var  = VARIABLE | QUOTED_STRING
+    marker_op   = '===' | '==' | '~=' | '!=' | '<=' | '>=' | '<' | '>'
+                | 'in' | 'not in'
+
+Marker nodes are built while tokens are consumed, without going through an
+intermediate parse tree.
+"""
+
+from __future__ import annotations
+
+import re
+import typing as t
+
+from dep_logic.markers.any import AnyMarker
+from dep_logic.markers.base import MARKERS_ALLOWING_SET, BaseMarker, InvalidMarker
+from dep_logic.markers.single import MarkerExpression
+from dep_logic.markers.union import MarkerUnion
+from dep_logic.utils import get_reflect_op, normalize_name
+
+_TOKEN_RE = re.compile(
+    r"""
+    [ \t]*
+    (?:
+        (?P<LPAREN>\()
+        |(?P<RPAREN>\))
+        |(?P<STRING>'[^']*'|"[^"]*")
+        |(?P<OP>===|==|~=|!=|<=|>=|<|>)
+        |(?P<BOOLOP>\b(?:or|and)\b)
+        |(?P<NOT_IN>\bnot[ \t]+in\b)
+        |(?P<IN>\bin\b)
+        |(?P<VARIABLE>
+            \b(?:
+                python_version
+                |python_full_version
+                |os[._]name
+                |sys[._]platform
+                |platform_(?:release|system)
+                |platform[._](?:version|machine|python_implementation)
+                |python_implementation
+                |implementation_(?:name|version)
+                |extras?
+                |dependency_groups
+            )\b
+        )
+        |(?P<END>[ \t]*\Z)
+    )
+    """,
+    re.VERBOSE,
+)
+
+_VARIABLE_ALIASES = {
+    "os.name": "os_name",
+    "sys.platform": "sys_platform",
+    "platform.version": "platform_version",
+    "platform.machine": "platform_machine",
+    "platform.python_implementation": "platform_python_implementation",
+    "python_implementation": "platform_python_implementation",
+}
+
+
+def build_and(markers: t.Iterable[BaseMarker]) -> BaseMarker:
+    """Combine the markers of an ``and`` group, left to right."""
+    result: BaseMarker = AnyMarker()
+    for marker in markers:
+        result &= marker
+    return result
+
+
+def build_or(markers: t.Iterable[BaseMarker]) -> BaseMarker:
+    """Combine the markers of an ``or`` group."""
+    return MarkerUnion.of(*markers)
+
+
+class Token(t.NamedTuple):
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+class MarkerParser:
+    """Recursive descent parser for PEP 508 markers.
+
+    The ``make_*`` methods decide what is built from the parsed pieces,
+    by default they return simplified marker nodes.
+    """
+
+    __slots__ = ("_next", "_position", "source")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._position = 0
+        self._next: Token | None = None
+
+    def parse(self) -> t.Any:
+        result = self._parse_or()
+        self._expect("END", "end of marker expression")
+        return result
+
+    def make_item(self, name: str, op: str, value: str, reversed: bool) -> t.Any:
+        return MarkerExpression(name, op, value, reversed)
+
+    def make_and(self, items: list[t.Any]) -> t.Any:
+        return build_and(items)
+
+    def make_or(self, items: list[t.Any]) -> t.Any:
+        return build_or(items)
+
+    def _peek(self) -> Token:
+        if self._next is None:
+            match = _TOKEN_RE.match(self.source, self._position)
+            if match is None or (kind := match.lastgroup) is None:
+                # Let the caller report what was expected at this position
+                self._next = Token("UNKNOWN", "", self._position, self._position)
+            else:
+                self._next = Token(
+                    kind, match.group(kind), match.start(kind), match.end()
+                )
+        return self._next
+
+    def _read(self) -> Token:
+        token = self._peek()
+        self._position = token.end
+        self._next = None
+        return token
+
+    def _expect(self, kind: str, expected: str) -> Token:
+        if (token := self._peek()).kind != kind:
+            self._error(f"Expected {expected}", token.start)
+        return self._read()
+
+    def _error(self, message: str, position: int) -> t.NoReturn:
+        # Skip leading whitespace so that the caret points to the offending token
+        while self.source[position : position + 1] in (" ", "\t"):
+            position += 1
+        raise InvalidMarker(f"{message}\n    {self.source}\n    {' ' * position}^")
+
+    def _parse_or(self) -> t.Any:
+        items = [self._parse_and()]
+        while (token := self._peek()).kind == "BOOLOP" and token.text == "or":
+            self._read()
+            items.append(self._parse_and())
+        return self.make_or(items)
+
+    def _parse_and(self) -> t.Any:
+        items = [self._parse_atom()]
+        while (token := self._peek()).kind == "BOOLOP" and token.text == "and":
+            self._read()
+            items.append(self._parse_atom())
+        return self.make_and(items)
+
+    def _parse_atom(self) -> t.Any:
+        if self._peek().kind == "LPAREN":
+            self._read()
+            result = self._parse_or()
+            self._expect("RPAREN", "matching right parenthesis for marker expression")
+            return result
+        return self._parse_item()
+
+    def _parse_item(self) -> t.Any:
+        left = self._parse_var()
+        token = self._read()
+        if token.kind == "OP":
+            op = token.text
+        elif token.kind == "IN":
+            op = "in"
+        elif token.kind == "NOT_IN":
+            op = "not in"
+        else:
+            self._error(
+                "Expected marker operator, one of "
+                "<=, <, !=, ==, >=, >, ~=, ===, in, not in",
+                token.start,
+            )
+        right = self._parse_var()
+        if left.kind == "VARIABLE" and right.kind == "STRING":
+            name, value, reversed = left.text, right.text[1:-1], False
+        elif left.kind == "STRING" and right.kind == "VARIABLE":
+            name, value, reversed = right.text, left.text[1:-1], True
+            op = get_reflect_op(op)
+        else:
+            self._error(
+                "Expected a marker variable compared with a quoted string", left.start
+            )
+        name = _VARIABLE_ALIASES.get(name, name)
+        # Normalize extra names the same way as packaging does (PEP 685)
+        if name == "extra" or (reversed and name in MARKERS_ALLOWING_SET):
+            value = normalize_name(value)
+        return self.make_item(name, op, value, reversed)
+
+    def _parse_var(self) -> Token:
+        if (token := self._peek()).kind not in ("VARIABLE", "STRING"):
+            self._error("Expected a marker variable or quoted string", token.start)
+        return self._read()
+
+
+def parse_marker_string(source: str) -> BaseMarker:
+    """Parse a non-empty marker string into a marker node.
+
+    Raises:
+        InvalidMarker: if the string is not a valid PEP 508 marker.
+    """
+    return MarkerParser(source).parse()
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import bisect
+import itertools
+import typing as t
+
+from dep_logic.markers.any import AnyMarker
+from dep_logic.markers.base import MARKERS_ALLOWING_SET, BaseMarker
+from dep_logic.markers.lazy import LazyMarker
+from dep_logic.markers.multi import MultiMarker
+from dep_logic.markers.python import PythonVersionSet, python_version_set
+from dep_logic.markers.single import (
+    PYTHON_VERSION_MARKERS,
+    EqualityMarkerUnion,
+    InequalityMultiMarker,
+    MarkerExpression,
+    SingleMarker,
+)
+from dep_logic.markers.union import MarkerUnion
+
+# A cell of the space of one variable, with the value of the atoms in it
+Cell = t.Tuple[BaseMarker, t.Dict[SingleMarker, bool]]
+
+_IGNORED_NAMES = {"extra", *MARKERS_ALLOWING_SET}
+# Values of these variables may be equal as versions but differ as strings
+_VERSION_COMPARED_NAMES = {
+    *SingleMarker._VERSION_LIKE_MARKER_NAME,
+    "implementation_version",
+}
+_NEGATED_OPS = {
+    "==": "!=",
+    "!=": "==",
+    "<": ">=",
+    ">=": "<",
+    ">": "<=",
+    "<=": ">",
+    "in": "not in",
+    "not in": "in",
+}
+
+
+def _collect_atoms(
+    marker: BaseMarker, atoms: dict[str, dict[SingleMarker, None]]
+) -> None:
+    if isinstance(marker, LazyMarker):
+        marker = marker.resolve()
+    if isinstance(marker, (MultiMarker, MarkerUnion)):
+        for child in marker.markers:
+            _collect_atoms(child, atoms)
+    elif isinstance(marker, SingleMarker) and marker.name not in _IGNORED_NAMES:
+        group = "python" if marker.name in PYTHON_VERSION_MARKERS else marker.name
+        atoms.setdefault(group, {})[marker] = None
+
+
+def _python_cells(atoms: t.Iterable[SingleMarker]) -> list[Cell] | None:
+    sets: dict[SingleMarker, PythonVersionSet] = {}
+    for atom in atoms:
+        if not isinstance(atom, MarkerExpression):
+            return None
+        if (version_set := python_version_set(atom)) is None:
+            return None
+        sets[atom] = version_set
+    points = sorted({0, *(bound for s in sets.values() for bound in s.bounds)})
+    cells: list[Cell] = []
+    for lower, upper in itertools.zip_longest(points, points[1:]):
+        cell = PythonVersionSet.interval(lower, upper).to_marker()
+        truth = {
+            atom: bisect.bisect_right(s.bounds, lower) % 2 == 1
+            for atom, s in sets.items()
+        }
+        cells.append((cell, truth))
+    return cells
+
+
+def _equality_cells(name: str, atoms: t.Iterable[SingleMarker]) -> list[Cell] | None:
+    if name in _VERSION_COMPARED_NAMES:
+        return None
+    values: dict[str, None] = {}
+    for atom in atoms:
+        if isinstance(atom, (EqualityMarkerUnion, InequalityMultiMarker)):
+            values.update(dict.fromkeys(atom.values))
+        elif (
+            isinstance(atom, MarkerExpression)
+            and not atom.reversed
+            and atom.op in ("==", "!=")
+        ):
+            values[atom.value] = None
+        else:
+            return None
+
+    def is_true(atom: SingleMarker, value: str | None) -> bool:
+        if isinstance(atom, EqualityMarkerUnion):
+            return value in atom.values
+        if isinstance(atom, InequalityMultiMarker):
+            return value not in atom.values
+        assert isinstance(atom, MarkerExpression)
+        return (atom.value == value) is (atom.op == "==")
+
+    cells: list[Cell] = [
+        (MarkerExpression(name, "==", value), {a: is_true(a, value) for a in atoms})
+        for value in values
+    ]
+    # All the other values
+    cells.append(
+        (
+            MultiMarker.of(*(MarkerExpression(name, "!=", value) for value in values)),
+            {a: is_true(a, None) for a in atoms},
+        )
+    )
+    return cells
+
+
+def _negate(atom: SingleMarker) -> BaseMarker:
+    if isinstance(atom, EqualityMarkerUnion):
+        return InequalityMultiMarker.of(atom.name, atom.values)
+    if isinstance(atom, InequalityMultiMarker):
+        return EqualityMarkerUnion.of(atom.name, atom.values)
+    assert isinstance(atom, MarkerExpression)
+    if atom.op in _NEGATED_OPS:
+        return MarkerExpression(
+            atom.name, _NEGATED_OPS[atom.op], atom.value, atom.reversed
+        )
+    negated = ~atom.specifier
+    ranges = getattr(negated, "ranges", (negated,))
+    return MarkerUnion.of(
+        *(MarkerExpression.from_specifier(atom.name, r) or AnyMarker() for r in ranges)
+    )
+
+
+def _refined_cells(atoms: t.Iterable[SingleMarker]) -> list[Cell]:
+    cells: list[Cell] = [(AnyMarker(), {})]
+    for atom in atoms:
+        negated = _negate(atom)
+        new_cells: list[Cell] = []
+        for cell, truth in cells:
+            for part, value in ((cell & atom, True), (cell & negated, False)):
+                if not part.is_empty():
+                    new_cells.append((part, {**truth, atom: value}))
+        cells = new_cells
+    return cells
+
+
+# A marker with some of its atoms replaced by their value: a bool, an atom, or
+# an (is_multi, children) pair for the and/or of the remaining children
+Residual = t.Union[bool, SingleMarker, t.Tuple[bool, t.Tuple[t.Any, ...]]]
+
+
+def _residual(marker: BaseMarker) -> Residual:
+    if isinstance(marker, LazyMarker):
+        marker = marker.resolve()
+    if isinstance(marker, (MultiMarker, MarkerUnion)):
+        return _combine(
+            isinstance(marker, MultiMarker), [_residual(m) for m in marker.markers]
+        )
+    if isinstance(marker, SingleMarker) and marker.name not in _IGNORED_NAMES:
+        return marker
+    return not marker.is_empty()
+
+
+def _combine(is_multi: bool, children: t.Iterable[Residual]) -> Residual:
+    remaining: list[Residual] = []
+    for child in children:
+        if isinstance(child, bool):
+            if child is not is_multi:
+                # False in an and, True in an or
+                return child
+        else:
+            remaining.append(child)
+    if not remaining:
+        return is_multi
+    if len(remaining) == 1:
+        return remaining[0]
+    return (is_multi, tuple(remaining))
+
+
+def _reduce(residual: Residual, truth: dict[SingleMarker, bool]) -> Residual:
+    if isinstance(residual, bool):
+        return residual
+    if isinstance(residual, tuple):
+        is_multi, children = residual
+        return _combine(is_multi, (_reduce(child, truth) for child in children))
+    return truth.get(residual, residual)
+
+
+def _intersect(cells: BaseMarker, region: BaseMarker) -> BaseMarker:
+    if cells.is_any():
+        return region
+    if region.is_any():
+        return cells
+    return MultiMarker(cells, region)
+
+
+class _Partitioner:
+    """Build the regions as a decision diagram over the variables.
+
+    A node is a variable and what remains of the markers once the values of the
+    atoms on the previous variables are known. Nodes with the same remainders
+    are shared, and a variable whose cells all lead to the same node is
+    skipped. The region of each outcome is built from the last variable up,
+    joining the cells that lead to the same sub-region, so no simplification
+    across variables is needed.
+    """
+
+    def __init__(self, variable_cells: list[list[Cell]]) -> None:
+        self.variable_cells = variable_cells
+        self._cache: dict[
+            tuple[int, tuple[Residual, ...]], dict[tuple[Residual, ...], BaseMarker]
+        ] = {}
+
+    def regions(
+        self, level: int, key: tuple[Residual, ...]
+    ) -> dict[tuple[Residual, ...], BaseMarker]:
+        """Return the regions of the outcomes reachable from a node."""
+        if level == len(self.variable_cells):
+            return {key: AnyMarker()}
+        if (result := self._cache.get((level, key))) is not None:
+            return result
+        children: dict[tuple[Residual, ...], list[BaseMarker]] = {}
+        for cell, truth in self.variable_cells[level]:
+            child = tuple(_reduce(residual, truth) for residual in key)
+            children.setdefault(child, []).append(cell)
+        if len(children) == 1:
+            result = self.regions(level + 1, next(iter(children)))
+        else:
+            # Outcome -> sub-region -> cells of this variable leading to it
+            parts: dict[tuple[Residual, ...], dict[BaseMarker, list[BaseMarker]]] = {}
+            for child, cells in children.items():
+                for outcome, region in self.regions(level + 1, child).items():
+                    parts.setdefault(outcome, {}).setdefault(region, []).extend(cells)
+            result = {}
+            for outcome, sub_regions in parts.items():
+                # Only cells of the same variable are simplified together
+                alternatives = [
+                    _intersect(
+                        cells[0] if len(cells) == 1 else MarkerUnion.of(*cells), region
+                    )
+                    for region, cells in sub_regions.items()
+                ]
+                result[outcome] = (
+                    alternatives[0]
+                    if len(alternatives) == 1
+                    else MarkerUnion(*alternatives)
+                )
+        self._cache[(level, key)] = result
+        return result
+
+
+def partition(markers: t.Iterable[BaseMarker]) -> list[BaseMarker]:
+    """Split the space of environments into disjoint regions where each of the
+    given markers evaluates to the same value.
+
+    The regions are built from the boundaries of the marker expressions on each
+    variable, python versions being split at the bounds of the version ranges.
+    Regions where all markers agree are merged, so there is one region for each
+    combination of values the markers can take. Markers on extras and
+    dependency groups are ignored, they are not part of the environment.
+
+    Args:
+        markers: The markers to partition the environments for.
+
+    Returns:
+        The markers of the regions, which are pairwise disjoint and cover all
+        environments.
+    """
+    markers = list(markers)
+    atoms: dict[str, dict[SingleMarker, None]] = {}
+    for marker in markers:
+        _collect_atoms(marker, atoms)
+    variable_cells: list[list[Cell]] = []
+    for name, group in atoms.items():
+        cells = (
+            _python_cells(group) if name == "python" else _equality_cells(name, group)
+        )
+        variable_cells.append(cells if cells is not None else _refined_cells(group))
+    residuals = tuple(_residual(marker) for marker in markers)
+    return list(_Partitioner(variable_cells).regions(0, residuals).values())
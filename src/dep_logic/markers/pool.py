@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import typing as t
+
+from dep_logic.markers.base import BaseMarker
+from dep_logic.markers.lazy import LazyMarker
+from dep_logic.markers.multi import MultiMarker
+from dep_logic.markers.union import MarkerUnion
+
+_MemoKey = t.Tuple[str, int, int]
+
+
+class MarkerPool:
+    """A store of markers that shares equal subtrees between its members.
+
+    Markers added to the pool are rebuilt from shared nodes, so that a subtree
+    that appears in many markers is stored only once. Each node counts the
+    references from its parents and from the callers of `add`, and is dropped
+    when `release` removes the last one. The results of `intersect` and `union`
+    between pool members are memoized as long as the nodes are in the pool.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: dict[t.Hashable, BaseMarker] = {}
+        self._keys: dict[int, t.Hashable] = {}
+        self._refcounts: dict[int, int] = {}
+        self._memo: dict[_MemoKey, BaseMarker] = {}
+        self._memo_keys: dict[int, list[_MemoKey]] = {}
+        self._visited = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, marker: object) -> bool:
+        return self._keys.get(id(marker)) is not None
+
+    @property
+    def dedup_ratio(self) -> float:
+        """The number of nodes in all added markers, counted once per marker,
+        divided by the number of distinct nodes stored in the pool.
+        """
+        return self._visited / len(self._nodes) if self._nodes else 1.0
+
+    def add(self, marker: BaseMarker) -> BaseMarker:
+        """Add a marker to the pool and return the shared equal marker."""
+        node = self._intern(marker)
+        self._refcounts[id(node)] += 1
+        return node
+
+    def release(self, marker: BaseMarker) -> None:
+        """Drop a reference returned by `add`, `intersect` or `union`."""
+        if marker not in self:
+            raise ValueError(f"{marker!r} is not in the pool")
+        stack = [marker]
+        while stack:
+            node = stack.pop()
+            self._refcounts[id(node)] -= 1
+            if self._refcounts[id(node)] > 0:
+                continue
+            del self._nodes[self._keys.pop(id(node))]
+            del self._refcounts[id(node)]
+            for key in self._memo_keys.pop(id(node), ()):
+                self._memo.pop(key, None)
+            if isinstance(node, (MultiMarker, MarkerUnion)):
+                stack.extend(node.markers)
+
+    def intersect(self, marker1: BaseMarker, marker2: BaseMarker) -> BaseMarker:
+        """Return the shared ``marker1 & marker2`` of two markers returned by
+        the pool, computing it only once.
+        """
+        return self._operate("&", marker1, marker2)
+
+    def union(self, marker1: BaseMarker, marker2: BaseMarker) -> BaseMarker:
+        """Return the shared ``marker1 | marker2`` of two markers returned by
+        the pool, computing it only once.
+        """
+        return self._operate("|", marker1, marker2)
+
+    def _operate(self, op: str, marker1: BaseMarker, marker2: BaseMarker) -> BaseMarker:
+        for marker in (marker1, marker2):
+            if marker not in self:
+                raise ValueError(f"{marker!r} is not in the pool")
+        key = (op, id(marker1), id(marker2))
+        result = self._memo.get(key)
+        if result is not None:
+            self._refcounts[id(result)] += 1
+            return result
+        result = self._memo[key] = self.add(
+            marker1 & marker2 if op == "&" else marker1 | marker2
+        )
+        # The memo doesn't keep the nodes alive, the entry is forgotten
+        # when any of them is dropped from the pool.
+        for node in (marker1, marker2, result):
+            self._memo_keys.setdefault(id(node), []).append(key)
+        return result
+
+    def _intern(self, marker: BaseMarker) -> BaseMarker:
+        self._visited += 1
+        if isinstance(marker, LazyMarker):
+            marker = marker.resolve()
+        if isinstance(marker, (MultiMarker, MarkerUnion)):
+            children = [self._intern(child) for child in marker.markers]
+            key: t.Hashable = (type(marker), tuple(map(id, children)))
+        else:
+            children = []
+            key = marker
+        node = self._nodes.get(key)
+        if node is not None:
+            return node
+        if any(c is not o for c, o in zip(children, getattr(marker, "markers", ()))):
+            node = type(marker)(*children)
+        else:
+            node = marker
+        self._nodes[key] = node
+        self._keys[id(node)] = key
+        self._refcounts[id(node)] = 0
+        for child in children:
+            self._refcounts[id(child)] += 1
+        return node
@@ -0,0 +1,347 @@
+"""Python version markers as sets of integer intervals.
+
+A python version ``X.Y.Z`` is encoded as the integer ``X << 20 | Y << 10 | Z``,
+and a ``python_version``/``python_full_version`` marker as the set of encoded
+versions it accepts. Logic operations on such sets are integer comparisons
+instead of specifier operations.
+
+In the sets, a version ``v`` is the point ``2 * v`` and the point ``2 * v + 1``
+stands for all versions between ``v`` and the next micro release, such as post
+releases, so that ``> "3.8.1"`` and ``>= "3.8.2"`` stay different sets as they
+are different specifiers.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+import typing as t
+from dataclasses import dataclass
+
+from dep_logic.markers.any import AnyMarker
+from dep_logic.markers.base import BaseMarker
+from dep_logic.markers.empty import EmptyMarker
+from dep_logic.utils import DATACLASS_ARGS
+
+if t.TYPE_CHECKING:
+    from dep_logic.markers.single import MarkerExpression
+    from dep_logic.specifiers import BaseSpecifier
+
+_PART_BITS = 10
+_PART_LIMIT = 1 << _PART_BITS
+_MINOR_STEP = 1 << _PART_BITS
+_VERSION_RE = re.compile(r"\s*(\d+)(?:\.(\d+))?(?:\.(\d+))?(\.\*)?\s*")
+
+
+def encode_version(major: int, minor: int = 0, micro: int = 0) -> int:
+    """Encode a python version as an integer, preserving the version order."""
+    return (major << 2 * _PART_BITS) | (minor << _PART_BITS) | micro
+
+
+def decode_version(value: int) -> tuple[int, int, int]:
+    """Decode an integer made by `encode_version`."""
+    mask = _PART_LIMIT - 1
+    return value >> 2 * _PART_BITS, (value >> _PART_BITS) & mask, value & mask
+
+
+@dataclass(frozen=True, unsafe_hash=True, **DATACLASS_ARGS)
+class PythonVersionSet:
+    """A set of python versions, stored as a sorted tuple of the points
+    where the membership flips. A point belongs to the set if an odd number
+    of boundaries are less than or equal to it.
+    """
+
+    bounds: tuple[int, ...] = ()
+
+    @classmethod
+    def full(cls) -> PythonVersionSet:
+        return cls((0,))
+
+    @classmethod
+    def interval(cls, lower: int, upper: int | None = None) -> PythonVersionSet:
+        """The points ``p`` with ``lower <= p < upper``."""
+        if upper is None:
+            return cls((lower,))
+        if upper <= lower:
+            return cls()
+        return cls((lower, upper))
+
+    @classmethod
+    def from_marker(cls, marker: BaseMarker) -> PythonVersionSet | None:
+        """Convert a marker on python versions to a set, or return None if it
+        refers to other variables or to versions that can't be encoded.
+        """
+        from dep_logic.markers.multi import MultiMarker
+        from dep_logic.markers.single import MarkerExpression
+        from dep_logic.markers.union import MarkerUnion
+
+        if isinstance(marker, MarkerExpression):
+            return python_version_set(marker)
+        if marker.is_any():
+            return cls.full()
+        if marker.is_empty():
+            return cls()
+        if isinstance(marker, (MultiMarker, MarkerUnion)):
+            result = cls.full() if isinstance(marker, MultiMarker) else cls()
+            for child in marker.markers:
+                if (child_set := cls.from_marker(child)) is None:
+                    return None
+                if isinstance(marker, MultiMarker):
+                    result &= child_set
+                else:
+                    result |= child_set
+            return result
+        return None
+
+    def is_empty(self) -> bool:
+        return not self.bounds
+
+    def is_any(self) -> bool:
+        return self.bounds == (0,)
+
+    def is_compound(self) -> bool:
+        """Return True if the set is neither a single interval nor the
+        complement of one.
+        """
+        return len(self.bounds) > 3 or (len(self.bounds) == 3 and self.bounds[0] != 0)
+
+    def __contains__(self, version: str) -> bool:
+        match = _VERSION_RE.fullmatch(version)
+        if match is None or match.group(4):
+            raise ValueError(f"Invalid python version: {version!r}")
+        point = _point(*(int(p or 0) for p in match.group(1, 2, 3)))
+        return sum(bound <= point for bound in self.bounds) % 2 == 1
+
+    def _combine(self, other: PythonVersionSet, both: bool) -> PythonVersionSet:
+        bounds: list[int] = []
+        i = j = 0
+        inside_self = inside_other = inside = False
+        left, right = self.bounds, other.bounds
+        while i < len(left) or j < len(right):
+            if j == len(right) or (i < len(left) and left[i] <= right[j]):
+                point = left[i]
+            else:
+                point = right[j]
+            if i < len(left) and left[i] == point:
+                inside_self = not inside_self
+                i += 1
+            if j < len(right) and right[j] == point:
+                inside_other = not inside_other
+                j += 1
+            new_inside = (
+                inside_self and inside_other if both else inside_self or inside_other
+            )
+            if new_inside != inside:
+                bounds.append(point)
+                inside = new_inside
+        return PythonVersionSet(tuple(bounds))
+
+    def __and__(self, other: PythonVersionSet) -> PythonVersionSet:
+        return self._combine(other, True)
+
+    def __or__(self, other: PythonVersionSet) -> PythonVersionSet:
+        return self._combine(other, False)
+
+    def __invert__(self) -> PythonVersionSet:
+        if self.bounds[:1] == (0,):
+            return PythonVersionSet(self.bounds[1:])
+        return PythonVersionSet((0, *self.bounds))
+
+    def intervals(self) -> list[tuple[int, int | None]]:
+        """Return the ``[lower, upper)`` intervals of the set, the upper bound
+        of the last interval may be None for an unbounded interval.
+        """
+        bounds: list[int | None] = [*self.bounds]
+        if len(bounds) % 2:
+            bounds.append(None)
+        return [
+            (t.cast(int, bounds[i]), bounds[i + 1]) for i in range(0, len(bounds), 2)
+        ]
+
+    def to_marker(self) -> BaseMarker:
+        """Convert the set to the canonical python version markers."""
+        from dep_logic.markers.multi import MultiMarker
+        from dep_logic.markers.union import MarkerUnion
+
+        if self.is_empty():
+            return EmptyMarker()
+        if self.is_any():
+            return AnyMarker()
+        if self.bounds[0] == 0 and len(self.bounds) % 2 == 1:
+            # Unbounded on both sides, prefer excluding the holes if possible
+            excluded = [_single_version(*hole) for hole in (~self).intervals()]
+            if None not in excluded:
+                markers = [
+                    _expression(name, "!=", value)
+                    for name, value in t.cast("list[tuple[str, str]]", excluded)
+                ]
+                return markers[0] if len(markers) == 1 else MultiMarker(*markers)
+        parts = [_interval_marker(lower, upper) for lower, upper in self.intervals()]
+        return parts[0] if len(parts) == 1 else MarkerUnion(*parts)
+
+    def __str__(self) -> str:
+        return str(self.to_marker())
+
+    def __repr__(self) -> str:
+        return f"<PythonVersionSet {self}>"
+
+
+def _point(major: int, minor: int = 0, micro: int = 0) -> int:
+    return encode_version(major, minor, micro) << 1
+
+
+def _format(point: int, minor_only: bool) -> str:
+    major, minor, micro = decode_version(point >> 1)
+    return f"{major}.{minor}" if minor_only else f"{major}.{minor}.{micro}"
+
+
+def _is_minor(point: int) -> bool:
+    return point & ((_PART_LIMIT << 1) - 1) == 0
+
+
+def _expression(name: str, op: str, value: str) -> MarkerExpression:
+    from dep_logic.markers.single import MarkerExpression
+
+    return MarkerExpression(name, op, value)
+
+
+def _single_version(lower: int, upper: int | None) -> tuple[str, str] | None:
+    """Return the marker name and value if the interval is a single minor
+    or micro release.
+    """
+    if upper is None or lower % 2:
+        return None
+    if _is_minor(lower) and upper == lower + 2 * _MINOR_STEP:
+        return "python_version", _format(lower, True)
+    if upper == lower + 1:
+        return "python_full_version", _format(lower, False)
+    return None
+
+
+def _bound(op: str, point: int) -> MarkerExpression:
+    if point % 2:
+        # Right above a version: ">=" becomes ">" and "<" becomes "<="
+        op = {">=": ">", "<": "<="}[op]
+    elif _is_minor(point):
+        return _expression("python_version", op, _format(point, True))
+    return _expression("python_full_version", op, _format(point, False))
+
+
+def _interval_marker(lower: int, upper: int | None) -> BaseMarker:
+    from dep_logic.markers.multi import MultiMarker
+
+    if (single := _single_version(lower, upper)) is not None:
+        return _expression(single[0], "==", single[1])
+    if upper is None:
+        return _bound(">=", lower)
+    major, minor, micro = decode_version(lower >> 1)
+    if (
+        lower != 0
+        and lower % 2 == 0
+        and upper == _point(*((major + 1, 0) if micro == 0 else (major, minor + 1)))
+    ):
+        return _bound("~=", lower)
+    if lower == 0:
+        return _bound("<", upper)
+    return MultiMarker(_bound(">=", lower), _bound("<", upper))
+
+
+def python_version_set(
+    marker: MarkerExpression, by_minor: bool = True
+) -> PythonVersionSet | None:
+    """Convert a single python version marker to a set of versions.
+
+    Args:
+        marker: The marker to convert.
+        by_minor: Whether python_version values are compared by minor
+            releases as in a real environment. If False they are compared as
+            plain versions, like the version specifiers do.
+    """
+    return _from_expression(
+        marker.name,
+        marker.op,
+        marker.value,
+        by_minor and marker.name == "python_version",
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _from_expression(
+    name: str, op: str, value: str, by_minor: bool
+) -> PythonVersionSet | None:
+    if name not in ("python_version", "python_full_version"):
+        return None
+    match = _VERSION_RE.fullmatch(value)
+    if match is None:
+        return None
+    major, minor, micro, wildcard = match.groups()
+    parts = [int(p) for p in (major, minor, micro) if p is not None]
+    if any(p >= _PART_LIMIT for p in parts):
+        return None
+    if by_minor and len(parts) != 2 and not wildcard:
+        # python_version is compared as X.Y, other lengths don't map to ranges
+        return None
+    if wildcard:
+        if op not in ("==", "!=") or len(parts) > 2:
+            return None
+        lower = _point(*parts)
+        step = _MINOR_STEP if len(parts) == 2 else _MINOR_STEP * _PART_LIMIT
+        result = PythonVersionSet.interval(lower, lower + 2 * step)
+        return result if op == "==" else ~result
+    lower = _point(*parts)
+    # The first point above all versions equal to the value
+    upper = lower + (2 * _MINOR_STEP if by_minor else 1)
+    if op == "==":
+        return PythonVersionSet.interval(lower, upper)
+    if op == "!=":
+        return ~PythonVersionSet.interval(lower, upper)
+    if op == "<":
+        return PythonVersionSet.interval(0, lower)
+    if op == "<=":
+        return PythonVersionSet.interval(0, upper)
+    if op == ">":
+        return PythonVersionSet.interval(upper)
+    if op == ">=":
+        return PythonVersionSet.interval(lower)
+    if op == "~=" and len(parts) >= 2:
+        prefix = [*parts[:-2], parts[-2] + 1]
+        return PythonVersionSet.interval(lower, _point(*prefix))
+    return None
+
+
+def python_bounds(marker: BaseMarker) -> tuple[BaseSpecifier, BaseSpecifier]:
+    """Return the ranges of python versions for which the marker is surely
+    true and possibly true.
+
+    The marker is true for the versions of the first range, whatever the
+    values of the other variables, and false for the versions outside the
+    second range. Both are equal for a marker only made of python version
+    markers that convert to ranges of full versions.
+    """
+    from dep_logic.markers.lazy import LazyMarker
+    from dep_logic.markers.multi import MultiMarker
+    from dep_logic.markers.single import MarkerExpression
+    from dep_logic.markers.union import MarkerUnion
+    from dep_logic.specifiers import EmptySpecifier, RangeSpecifier
+
+    if isinstance(marker, LazyMarker):
+        marker = marker.resolve()
+    if isinstance(marker, (MultiMarker, MarkerUnion)):
+        bounds = [python_bounds(child) for child in marker.markers]
+        lower, upper = bounds[0]
+        for child_lower, child_upper in bounds[1:]:
+            if isinstance(marker, MultiMarker):
+                lower, upper = lower & child_lower, upper & child_upper
+            else:
+                lower, upper = lower | child_lower, upper | child_upper
+        return lower, upper
+    if marker.is_any():
+        return RangeSpecifier(), RangeSpecifier()
+    if marker.is_empty():
+        return EmptySpecifier(), EmptySpecifier()
+    if (
+        isinstance(marker, MarkerExpression)
+        and (specifier := marker._exact_python_range()) is not None
+    ):
+        return specifier, specifier
+    return EmptySpecifier(), marker.python_range()
@@ -3,17 +3,17 @@ from __future__ import annotations
 import functools
 import operator
 import typing as t
-from abc import abstractmethod
 from dataclasses import dataclass, field, replace
 
-from packaging.markers import default_environment
 from packaging.specifiers import InvalidSpecifier, Specifier
 from packaging.version import InvalidVersion, Version
 
 from dep_logic.markers.any import AnyMarker
-from dep_logic.markers.base import BaseMarker, EvaluationContext
+from dep_logic.markers.base import MARKERS_ALLOWING_SET, BaseMarker
 from dep_logic.markers.empty import EmptyMarker
+from dep_logic.markers.python import python_version_set
 from dep_logic.specifiers import BaseSpecifier
+from dep_logic.specifiers.arbitrary import ArbitrarySpecifier
 from dep_logic.specifiers.base import VersionSpecifier
 from dep_logic.specifiers.generic import GenericSpecifier
 from dep_logic.utils import DATACLASS_ARGS, OrderedSet, get_reflect_op, normalize_name
@@ -23,7 +23,6 @@ if t.TYPE_CHECKING:
     from dep_logic.markers.union import MarkerUnion
 
 PYTHON_VERSION_MARKERS = {"python_version", "python_full_version"}
-MARKERS_ALLOWING_SET = {"extras", "dependency_groups"}
 Operator = t.Callable[[str, t.Union[str, t.Set[str]]], bool]
 _operators: dict[str, Operator] = {
     "in": lambda lhs, rhs: lhs in rhs,
@@ -64,26 +63,6 @@ class SingleMarker(BaseMarker):
 
         return self
 
-    def evaluate(
-        self,
-        environment: dict[str, str | set[str]] | None = None,
-        context: EvaluationContext = "metadata",
-    ) -> bool:
-        current_environment = t.cast("dict[str, str|set[str]]", default_environment())
-        if context == "metadata":
-            current_environment["extra"] = ""
-        elif context == "lock_file":
-            current_environment.update(extras=set(), dependency_groups=set())
-        if environment:
-            current_environment.update(environment)
-        if "extra" in current_environment and current_environment["extra"] is None:
-            current_environment["extra"] = ""
-        return self._evaluate(current_environment)
-
-    @abstractmethod
-    def _evaluate(self, environment: dict[str, str | set[str]]) -> bool:
-        raise NotImplementedError
-
 
 @dataclass(unsafe_hash=True, **DATACLASS_ARGS)
 class MarkerExpression(SingleMarker):
@@ -92,6 +71,17 @@ class MarkerExpression(SingleMarker):
     value: str
     reversed: bool = field(default=False, compare=False, hash=False)
     _specifier: BaseSpecifier | None = field(default=None, compare=False, hash=False)
+    _python_range: BaseSpecifier | None = field(
+        default=None, init=False, compare=False, hash=False
+    )
+    # The value to compare with, normalized for extra names
+    _normalized_value: str = field(init=False, compare=False, hash=False)
+
+    def __post_init__(self) -> None:
+        if self.name == "extra" or self.name in MARKERS_ALLOWING_SET:
+            self._normalized_value = normalize_name(self.value)
+        else:
+            self._normalized_value = self.value
 
     @property
     def specifier(self) -> BaseSpecifier:
@@ -143,7 +133,44 @@ class MarkerExpression(SingleMarker):
             return parse_version_specifier(glue.join(versions))
         return parse_version_specifier(f"{self.op}{self.value}")
 
+    def python_range(self) -> BaseSpecifier:
+        result = self._python_range
+        if result is None:
+            result = self._python_range = self._get_python_range()
+        return result
+
+    def _get_python_range(self) -> BaseSpecifier:
+        from dep_logic.specifiers import RangeSpecifier
+
+        specifier = self._exact_python_range()
+        return RangeSpecifier() if specifier is None else specifier
+
+    def _exact_python_range(self) -> BaseSpecifier | None:
+        """The python versions matching the marker, or None if it is not a
+        python marker that can be converted to a range of full versions.
+        """
+        if self.name not in PYTHON_VERSION_MARKERS or self.reversed:
+            return None
+        if self.name == "python_full_version":
+            specifier = self.specifier
+        elif self.op not in ("in", "not in") and self.value.count(".") > 1:
+            # Compared with X.Y, can't be converted to a range of full versions
+            return None
+        else:
+            specifier = _normalize_python_version_specifier(self)
+        if isinstance(specifier, ArbitrarySpecifier):
+            return None
+        return specifier
+
     def __str__(self) -> str:
+        return self._rendered
+
+    def __reduce__(self) -> tuple[t.Any, ...]:
+        # The specifier and the other cached state are computed again on load
+        return _restore_expression, (self.name, self.op, self.value, self.reversed)
+
+    @functools.cached_property
+    def _rendered(self) -> str:
         if self.reversed:
             return f'"{self.value}" {get_reflect_op(self.op)} {self.name}'
         return f'{self.name} {self.op} "{self.value}"'
@@ -171,30 +198,23 @@ class MarkerExpression(SingleMarker):
         return MarkerUnion(self, other)
 
     def _evaluate(self, environment: dict[str, str | set[str]]) -> bool:
+        # The extra names in both the marker and the environment are normalized,
+        # in __post_init__ and prepare_environment() respectively.
+        value = self._normalized_value
         if self.name == "extra":
-            # Support batch comparison for "extra" markers
+            # "extra" is a set of all requested extras in a prepared environment
             extra = environment["extra"]
-            if isinstance(extra, str):
-                extra = {extra}
             assert self.op in ("==", "!=")
-            value = normalize_name(self.value)
-            extra = {normalize_name(v) for v in extra}
             return value in extra if self.op == "==" else value not in extra
 
         target = environment[self.name]
         if self.reversed:
-            lhs, rhs = self.value, target
+            lhs, rhs = value, target
             oper = _operators.get(get_reflect_op(self.op))
         else:
-            lhs, rhs = target, self.value
+            lhs, rhs = target, value
             assert isinstance(lhs, str)
             oper = _operators.get(self.op)
-        if self.name in MARKERS_ALLOWING_SET:
-            lhs = normalize_name(lhs)
-            if isinstance(rhs, set):
-                rhs = {normalize_name(v) for v in rhs}
-            else:
-                rhs = normalize_name(rhs)
         if isinstance(rhs, str):
             try:
                 spec = Specifier(f"{self.op}{rhs}")
@@ -219,12 +239,18 @@ class EqualityMarkerUnion(SingleMarker):
     def __str__(self) -> str:
         return " or ".join(f'{self.name} == "{value}"' for value in self.values)
 
-    def replace(self, values: OrderedSet[str]) -> BaseMarker:
+    @classmethod
+    def of(cls, name: str, values: t.Iterable[str]) -> BaseMarker:
+        """Build the union of ``name == value`` for all values in linear time."""
+        values = OrderedSet(values)
         if not values:
             return EmptyMarker()
         if len(values) == 1:
-            return MarkerExpression(self.name, "==", values.peek())
-        return replace(self, values=values)
+            return MarkerExpression(name, "==", values.peek())
+        return cls(name, values)
+
+    def replace(self, values: OrderedSet[str]) -> BaseMarker:
+        return self.of(self.name, values)
 
     @property
     def complexity(self) -> tuple[int, ...]:
@@ -264,7 +290,7 @@ class EqualityMarkerUnion(SingleMarker):
                 return replace(self, values=self.values | {other.value})
             if other.op == "!=":
                 if other.value in self.values:
-                    AnyMarker()
+                    return AnyMarker()
                 return other
             if all(v in other.specifier for v in self.values):
                 return other
@@ -291,12 +317,18 @@ class InequalityMultiMarker(SingleMarker):
     def __str__(self) -> str:
         return " and ".join(f'{self.name} != "{value}"' for value in self.values)
 
-    def replace(self, values: OrderedSet[str]) -> BaseMarker:
+    @classmethod
+    def of(cls, name: str, values: t.Iterable[str]) -> BaseMarker:
+        """Build the intersection of ``name != value`` for all values in linear time."""
+        values = OrderedSet(values)
         if not values:
             return AnyMarker()
         if len(values) == 1:
-            return MarkerExpression(self.name, "!=", values.peek())
-        return replace(self, values=values)
+            return MarkerExpression(name, "!=", values.peek())
+        return cls(name, values)
+
+    def replace(self, values: OrderedSet[str]) -> BaseMarker:
+        return self.of(self.name, values)
 
     @property
     def complexity(self) -> tuple[int, ...]:
@@ -359,17 +391,65 @@ class InequalityMultiMarker(SingleMarker):
         return environment[self.name] not in self.values
 
 
+def merge_equality_markers(
+    markers: t.Iterable[BaseMarker], op: t.Literal["==", "!="]
+) -> list[BaseMarker]:
+    """Merge the ``==`` (or ``!=``) markers sharing the same name into a single
+    `EqualityMarkerUnion` (or `InequalityMultiMarker`), at the position of the
+    first one. This is linear, unlike merging them pairwise.
+
+    Version-like and "extra" markers are left untouched since they are not
+    merged into such nodes.
+    """
+    node_class = EqualityMarkerUnion if op == "==" else InequalityMultiMarker
+    result: list[BaseMarker] = []
+    groups: dict[str, tuple[int, list[str]]] = {}
+    for marker in markers:
+        if isinstance(marker, node_class):
+            values: t.Iterable[str] = marker.values
+        elif (
+            isinstance(marker, MarkerExpression)
+            and marker.op == op
+            and marker.name != "extra"
+            and marker.name not in marker._VERSION_LIKE_MARKER_NAME
+        ):
+            values = [marker.value]
+        else:
+            result.append(marker)
+            continue
+        if marker.name not in groups:
+            groups[marker.name] = (len(result), [])
+            result.append(marker)
+        groups[marker.name][1].extend(values)
+    for name, (index, values) in groups.items():
+        if len(values) > 1:
+            result[index] = node_class.of(name, values)
+    return result
+
+
+@functools.lru_cache(maxsize=4096)
+def _restore_expression(
+    name: str, op: str, value: str, reversed: bool
+) -> MarkerExpression:
+    """Unpickle a marker expression, sharing the equal instances.
+
+    The cache is bounded so that unpickling untrusted or varied data doesn't
+    keep every value alive.
+    """
+    return MarkerExpression(name, op, value, reversed)
+
+
 @functools.lru_cache(maxsize=None)
 def _merge_single_markers(
     marker1: MarkerExpression,
     marker2: MarkerExpression,
     merge_class: type[MultiMarker | MarkerUnion],
 ) -> BaseMarker | None:
-    from dep_logic.markers.multi import MultiMarker
-    from dep_logic.markers.union import MarkerUnion
-
-    if {marker1.name, marker2.name} == PYTHON_VERSION_MARKERS:
-        return _merge_python_version_single_markers(marker1, marker2, merge_class)
+    if (
+        marker1.name in PYTHON_VERSION_MARKERS
+        and marker2.name in PYTHON_VERSION_MARKERS
+    ):
+        return _merge_python_version_markers(marker1, marker2, merge_class)
 
     if marker1.name != marker2.name:
         return None
@@ -379,6 +459,17 @@ def _merge_single_markers(
     if marker1.name == "extra":
         if marker1.value != marker2.value:  # type: ignore[attr-defined]
             return None
+    return _merge_specifiers(marker1, marker2, merge_class)
+
+
+def _merge_specifiers(
+    marker1: MarkerExpression,
+    marker2: MarkerExpression,
+    merge_class: type[MultiMarker | MarkerUnion],
+) -> BaseMarker | None:
+    from dep_logic.markers.multi import MultiMarker
+    from dep_logic.markers.union import MarkerUnion
+
     try:
         if merge_class is MultiMarker:
             result_specifier = marker1.specifier & marker2.specifier
@@ -402,6 +493,45 @@ def _merge_single_markers(
         return MarkerExpression.from_specifier(marker1.name, result_specifier)
 
 
+def _merge_python_version_markers(
+    marker1: MarkerExpression,
+    marker2: MarkerExpression,
+    merge_class: type[MultiMarker | MarkerUnion],
+) -> BaseMarker | None:
+    """Merge two python version markers, deciding the common cases with
+    integer interval sets and only building specifiers for the new ranges.
+    """
+    from dep_logic.markers.multi import MultiMarker
+
+    same_name = marker1.name == marker2.name
+    if not same_name and marker2.name == "python_version":
+        marker1, marker2 = marker2, marker1
+    # Markers on the same name are compared as plain versions, while
+    # python_version is compared by minor releases with python_full_version.
+    set1 = python_version_set(marker1, by_minor=not same_name)
+    set2 = python_version_set(marker2, by_minor=False)
+    if set1 is None or set2 is None:
+        if same_name:
+            return _merge_specifiers(marker1, marker2, merge_class)
+        return _merge_python_version_single_markers(marker1, marker2, merge_class)
+
+    merged = set1 & set2 if merge_class is MultiMarker else set1 | set2
+    # prefer original markers to avoid unnecessary changes
+    if merged == set1:
+        return marker1
+    if same_name and merged == set2:
+        return marker2
+    if merged.is_empty():
+        return EmptyMarker()
+    if merged.is_any():
+        return AnyMarker()
+    if merged.is_compound():
+        return None
+    if same_name:
+        return _merge_specifiers(marker1, marker2, merge_class)
+    return _merge_python_version_single_markers(marker1, marker2, merge_class)
+
+
 def _merge_python_version_single_markers(
     marker1: MarkerExpression,
     marker2: MarkerExpression,
@@ -1,33 +1,42 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterator
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING, Iterator
 
 from dep_logic.markers.any import AnyMarker
-from dep_logic.markers.base import BaseMarker, EvaluationContext
+from dep_logic.markers.base import BaseMarker
 from dep_logic.markers.empty import EmptyMarker
 from dep_logic.markers.multi import MultiMarker
-from dep_logic.markers.single import SingleMarker
+from dep_logic.markers.single import SingleMarker, merge_equality_markers
 from dep_logic.utils import DATACLASS_ARGS, flatten_items, intersection, union
 
+if TYPE_CHECKING:
+    from dep_logic.specifiers import BaseSpecifier
+
 
 @dataclass(init=False, frozen=True, unsafe_hash=True, **DATACLASS_ARGS)
 class MarkerUnion(BaseMarker):
     markers: tuple[BaseMarker, ...]
+    _python_range: BaseSpecifier | None = field(compare=False, hash=False)
 
     def __init__(self, *markers: BaseMarker) -> None:
         object.__setattr__(self, "markers", tuple(flatten_items(markers, MarkerUnion)))
+        object.__setattr__(self, "_python_range", None)
 
     def __iter__(self) -> Iterator[BaseMarker]:
         return iter(self.markers)
 
+    def __reduce__(self) -> tuple[type[MarkerUnion], tuple[BaseMarker, ...]]:
+        return MarkerUnion, self.markers
+
     @property
     def complexity(self) -> tuple[int, ...]:
         return tuple(sum(c) for c in zip(*(m.complexity for m in self.markers)))
 
     @classmethod
     def of(cls, *markers: BaseMarker) -> BaseMarker:
-        new_markers = flatten_items(markers, MarkerUnion)
+        new_markers = merge_equality_markers(flatten_items(markers, MarkerUnion), "==")
         old_markers: list[BaseMarker] = []
 
         while old_markers != new_markers:
@@ -135,12 +144,19 @@ class MarkerUnion(BaseMarker):
 
         return None
 
-    def evaluate(
-        self,
-        environment: dict[str, str | set[str]] | None = None,
-        context: EvaluationContext = "metadata",
-    ) -> bool:
-        return any(m.evaluate(environment, context) for m in self.markers)
+    def _evaluate(self, environment: dict[str, str | set[str]]) -> bool:
+        return any(m._evaluate(environment) for m in self.markers)
+
+    def python_range(self) -> BaseSpecifier:
+        result: BaseSpecifier | None = self._python_range
+        if result is None:
+            from dep_logic.specifiers import EmptySpecifier
+
+            result = EmptySpecifier()
+            for marker in self.markers:
+                result |= marker.python_range()
+            object.__setattr__(self, "_python_range", result)
+        return result
 
     def without_extras(self) -> BaseMarker:
         return self.exclude("extra")
@@ -166,4 +182,8 @@ class MarkerUnion(BaseMarker):
         return self.of(*(m.only(*marker_names) for m in self.markers))
 
     def __str__(self) -> str:
+        return self._rendered
+
+    @cached_property
+    def _rendered(self) -> str:
         return " or ".join(str(m) for m in self.markers)
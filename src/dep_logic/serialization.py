@@ -0,0 +1,314 @@
+"""A compact binary encoding of markers and specifiers.
+
+The encoding is made of a header, a string table and a node table::
+
+    header  = b"DLG" format_version
+    strings = count (length utf8_bytes)*
+    nodes   = count (tag payload)*
+    roots   = count node_index*
+
+All integers are unsigned LEB128 varints. Nodes are written after their
+children and refer to them, and to strings, by index. Equal nodes are only
+written once, so shared subtrees stay shared after decoding. Decoding builds
+the nodes directly from their parts, without simplifying them again.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+from packaging.version import Version
+
+from dep_logic.markers.any import AnyMarker
+from dep_logic.markers.base import BaseMarker
+from dep_logic.markers.empty import EmptyMarker
+from dep_logic.markers.lazy import LazyMarker
+from dep_logic.markers.multi import MultiMarker
+from dep_logic.markers.single import (
+    EqualityMarkerUnion,
+    InequalityMultiMarker,
+    MarkerExpression,
+)
+from dep_logic.markers.union import MarkerUnion
+from dep_logic.specifiers import (
+    AnySpecifier,
+    ArbitrarySpecifier,
+    BaseSpecifier,
+    EmptySpecifier,
+    GenericSpecifier,
+    RangeSpecifier,
+    UnionSpecifier,
+)
+from dep_logic.utils import OrderedSet
+
+Serializable = t.Union[BaseMarker, BaseSpecifier]
+
+MAGIC = b"DLG"
+FORMAT_VERSION = 1
+
+_ANY_MARKER = 0
+_EMPTY_MARKER = 1
+_MARKER_EXPRESSION = 2
+_EQUALITY_MARKER_UNION = 3
+_INEQUALITY_MULTI_MARKER = 4
+_MULTI_MARKER = 5
+_MARKER_UNION = 6
+_ANY_SPECIFIER = 7
+_EMPTY_SPECIFIER = 8
+_RANGE_SPECIFIER = 9
+_UNION_SPECIFIER = 10
+_ARBITRARY_SPECIFIER = 11
+_GENERIC_SPECIFIER = 12
+
+# Flags of a range specifier
+_INCLUDE_MIN = 1
+_INCLUDE_MAX = 2
+
+
+class _Encoder:
+    def __init__(self) -> None:
+        self.strings: dict[str, int] = {}
+        self.nodes: list[bytes] = []
+        self._by_id: dict[int, int] = {}
+        self._by_value: dict[t.Hashable, int] = {}
+        # Keep the encoded objects alive so that their ids are not reused
+        self._seen: list[Serializable] = []
+
+    def string(self, value: str) -> int:
+        return self.strings.setdefault(value, len(self.strings))
+
+    def optional_string(self, value: str | None) -> int:
+        return 0 if value is None else self.string(value) + 1
+
+    def node(self, obj: Serializable) -> int:
+        if (index := self._by_id.get(id(obj))) is not None:
+            return index
+        if isinstance(obj, LazyMarker):
+            index = self.node(obj.resolve())
+        else:
+            # Fields excluded from the comparison must match as well
+            key = (
+                type(obj),
+                obj,
+                getattr(obj, "reversed", getattr(obj, "simplified", None)),
+            )
+            if (index := self._by_value.get(key)) is None:
+                payload = self._encode(obj)
+                index = self._by_value[key] = len(self.nodes)
+                self.nodes.append(payload)
+        self._by_id[id(obj)] = index
+        self._seen.append(obj)
+        return index
+
+    def _encode(self, obj: Serializable) -> bytes:
+        if isinstance(obj, (MultiMarker, MarkerUnion)):
+            tag = _MULTI_MARKER if isinstance(obj, MultiMarker) else _MARKER_UNION
+            children = [self.node(child) for child in obj.markers]
+            return _pack(tag, len(children), *children)
+        if isinstance(obj, MarkerExpression):
+            return _pack(
+                _MARKER_EXPRESSION,
+                self.string(obj.name),
+                self.string(obj.op),
+                self.string(obj.value),
+                int(obj.reversed),
+            )
+        if isinstance(obj, (EqualityMarkerUnion, InequalityMultiMarker)):
+            tag = (
+                _EQUALITY_MARKER_UNION
+                if isinstance(obj, EqualityMarkerUnion)
+                else _INEQUALITY_MULTI_MARKER
+            )
+            values = [self.string(value) for value in obj.values]
+            return _pack(tag, self.string(obj.name), len(values), *values)
+        if isinstance(obj, AnyMarker):
+            return _pack(_ANY_MARKER)
+        if isinstance(obj, EmptyMarker):
+            return _pack(_EMPTY_MARKER)
+        if isinstance(obj, RangeSpecifier):
+            flags = (_INCLUDE_MIN if obj.include_min else 0) | (
+                _INCLUDE_MAX if obj.include_max else 0
+            )
+            return _pack(
+                _RANGE_SPECIFIER,
+                flags,
+                self.optional_string(None if obj.min is None else str(obj.min)),
+                self.optional_string(None if obj.max is None else str(obj.max)),
+                self.optional_string(obj.simplified),
+            )
+        if isinstance(obj, UnionSpecifier):
+            ranges = [self.node(r) for r in obj.ranges]
+            return _pack(
+                _UNION_SPECIFIER,
+                len(ranges),
+                *ranges,
+                self.optional_string(obj.simplified),
+            )
+        if isinstance(obj, ArbitrarySpecifier):
+            return _pack(_ARBITRARY_SPECIFIER, self.string(obj.target))
+        if isinstance(obj, GenericSpecifier):
+            return _pack(
+                _GENERIC_SPECIFIER, self.string(obj.op), self.string(obj.value)
+            )
+        if isinstance(obj, AnySpecifier):
+            return _pack(_ANY_SPECIFIER)
+        if isinstance(obj, EmptySpecifier):
+            return _pack(_EMPTY_SPECIFIER)
+        raise TypeError(f"Cannot serialize {type(obj).__name__} objects")
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _pack(*values: int) -> bytes:
+    buffer = bytearray()
+    for value in values:
+        _write_varint(buffer, value)
+    return bytes(buffer)
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.position = 0
+
+    def varint(self) -> int:
+        result = shift = 0
+        while True:
+            try:
+                byte = self.data[self.position]
+            except IndexError:
+                raise ValueError("Truncated data") from None
+            self.position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def bytes(self, length: int) -> bytes:
+        end = self.position + length
+        if end > len(self.data):
+            raise ValueError("Truncated data")
+        result = self.data[self.position : end]
+        self.position = end
+        return result
+
+
+def dumps_many(objects: t.Iterable[Serializable]) -> bytes:
+    """Encode markers and specifiers together, sharing their common nodes."""
+    encoder = _Encoder()
+    roots = [encoder.node(obj) for obj in objects]
+    buffer = bytearray(MAGIC)
+    buffer.append(FORMAT_VERSION)
+    _write_varint(buffer, len(encoder.strings))
+    for string in encoder.strings:
+        encoded = string.encode("utf-8")
+        _write_varint(buffer, len(encoded))
+        buffer += encoded
+    _write_varint(buffer, len(encoder.nodes))
+    for node in encoder.nodes:
+        buffer += node
+    buffer += _pack(len(roots), *roots)
+    return bytes(buffer)
+
+
+def dumps(obj: Serializable) -> bytes:
+    """Encode a marker or a specifier."""
+    return dumps_many([obj])
+
+
+def loads_many(data: bytes) -> list[Serializable]:
+    """Decode the objects encoded by `dumps_many`.
+
+    Raises:
+        ValueError: if the data is not a valid encoding.
+    """
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not an encoded marker or specifier")
+    if (version := data[len(MAGIC) : len(MAGIC) + 1]) != bytes([FORMAT_VERSION]):
+        raise ValueError(f"Unsupported format version: {version!r}")
+    reader = _Reader(data)
+    reader.position = len(MAGIC) + 1
+    strings = [
+        reader.bytes(reader.varint()).decode("utf-8") for _ in range(reader.varint())
+    ]
+    nodes: list[Serializable] = []
+
+    def string() -> str:
+        return strings[reader.varint()]
+
+    def optional_string() -> str | None:
+        index = reader.varint()
+        return None if index == 0 else strings[index - 1]
+
+    def children() -> list[t.Any]:
+        return [nodes[reader.varint()] for _ in range(reader.varint())]
+
+    try:
+        for _ in range(reader.varint()):
+            tag = reader.varint()
+            node: Serializable
+            if tag == _MULTI_MARKER:
+                node = MultiMarker(*children())
+            elif tag == _MARKER_UNION:
+                node = MarkerUnion(*children())
+            elif tag == _MARKER_EXPRESSION:
+                name, op, value = string(), string(), string()
+                node = MarkerExpression(name, op, value, bool(reader.varint()))
+            elif tag == _EQUALITY_MARKER_UNION:
+                name = string()
+                node = EqualityMarkerUnion(
+                    name, OrderedSet([string() for _ in range(reader.varint())])
+                )
+            elif tag == _INEQUALITY_MULTI_MARKER:
+                name = string()
+                node = InequalityMultiMarker(
+                    name, OrderedSet([string() for _ in range(reader.varint())])
+                )
+            elif tag == _ANY_MARKER:
+                node = AnyMarker()
+            elif tag == _EMPTY_MARKER:
+                node = EmptyMarker()
+            elif tag == _RANGE_SPECIFIER:
+                flags = reader.varint()
+                min_, max_ = optional_string(), optional_string()
+                node = RangeSpecifier(
+                    min=None if min_ is None else Version(min_),
+                    max=None if max_ is None else Version(max_),
+                    include_min=bool(flags & _INCLUDE_MIN),
+                    include_max=bool(flags & _INCLUDE_MAX),
+                    simplified=optional_string(),
+                )
+            elif tag == _UNION_SPECIFIER:
+                ranges = tuple(children())
+                node = UnionSpecifier(ranges, simplified=optional_string())
+            elif tag == _ARBITRARY_SPECIFIER:
+                node = ArbitrarySpecifier(string())
+            elif tag == _GENERIC_SPECIFIER:
+                op = string()
+                node = GenericSpecifier(op, string())
+            elif tag == _ANY_SPECIFIER:
+                node = AnySpecifier()
+            elif tag == _EMPTY_SPECIFIER:
+                node = EmptySpecifier()
+            else:
+                raise ValueError(f"Unknown node tag: {tag}")
+            nodes.append(node)
+        roots = children()
+    except IndexError:
+        raise ValueError("Invalid node or string reference") from None
+    if reader.position != len(data):
+        raise ValueError("Unexpected data after the encoded objects")
+    return roots
+
+
+def loads(data: bytes) -> Serializable:
+    """Decode an object encoded by `dumps`."""
+    roots = loads_many(data)
+    if len(roots) != 1:
+        raise ValueError(f"Expected one encoded object, got {len(roots)}")
+    return roots[0]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from functools import cached_property
+from functools import cached_property, lru_cache
 from typing import Any
 
 from packaging.specifiers import SpecifierSet
@@ -78,6 +78,21 @@ class RangeSpecifier(VersionSpecifier):
             return None
 
     def __str__(self) -> str:
+        return self._rendered
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Versions are pickled as strings, much smaller than their parsed state
+        return _restore_range, (
+            type(self),
+            None if self.min is None else str(self.min),
+            None if self.max is None else str(self.max),
+            self.include_min,
+            self.include_max,
+            self.simplified,
+        )
+
+    @cached_property
+    def _rendered(self) -> str:
         simplified = self._simplified_form
         if simplified is not None:
             return simplified
@@ -257,3 +272,25 @@ class RangeSpecifier(VersionSpecifier):
             include_min=union_include_min,
             include_max=union_include_max,
         )
+
+
+@lru_cache(maxsize=4096)
+def _restore_range(
+    cls: type[RangeSpecifier],
+    min: str | None,
+    max: str | None,
+    include_min: bool,
+    include_max: bool,
+    simplified: str | None,
+) -> RangeSpecifier:
+    """Unpickle a range specifier, sharing the equal instances.
+
+    The cache is bounded like the one of unpickled marker expressions.
+    """
+    return cls(
+        None if min is None else Version(min),
+        None if max is None else Version(max),
+        include_min,
+        include_max,
+        simplified,
+    )
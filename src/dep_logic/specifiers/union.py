@@ -77,6 +77,13 @@ class UnionSpecifier(VersionSpecifier):
         return None
 
     def __str__(self) -> str:
+        return self._rendered
+
+    def __reduce__(self) -> tuple[t.Any, ...]:
+        return type(self), (self.ranges, self.simplified)
+
+    @cached_property
+    def _rendered(self) -> str:
         if self._simplified_form is not None:
             return self._simplified_form
         return "||".join(map(str, self.ranges))
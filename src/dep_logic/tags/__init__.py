@@ -1,3 +1,5 @@
+from .lattice import EnvSpecSet
+from .matrix import WheelCompatMatrix
 from .platform import Platform, PlatformError
 from .tags import (
     EnvCompatibility,
@@ -6,6 +8,8 @@ from .tags import (
     InvalidWheelFilename,
     TagsError,
     UnsupportedImplementation,
+    filter_targets,
+    refresh_current,
 )
 
 __all__ = [
@@ -15,6 +19,10 @@ __all__ = [
     "UnsupportedImplementation",
     "InvalidWheelFilename",
     "EnvSpec",
+    "EnvSpecSet",
     "Implementation",
     "EnvCompatibility",
+    "WheelCompatMatrix",
+    "filter_targets",
+    "refresh_current",
 ]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import bisect
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Hashable, Iterable, Iterator, Tuple
+
+from . import os
+from .tags import EnvSpec
+
+if TYPE_CHECKING:
+    from ..specifiers import VersionSpecifier
+
+_GroupKey = Tuple[Hashable, ...]
+_VERSIONED_OS = (os.Manylinux, os.Musllinux, os.Macos)
+
+
+def _split_spec(spec: EnvSpec) -> tuple[_GroupKey, tuple[int, ...]]:
+    """Return the group of a target and its OS version in the group.
+
+    The group is made of the implementation and the platform family, either of
+    them is None if the target accepts any.
+    """
+    if spec.platform is None:
+        return (spec.implementation, None), ()
+    platform_os = spec.platform.os
+    if isinstance(platform_os, _VERSIONED_OS):
+        key: _GroupKey = (
+            spec.implementation,
+            (spec.platform.arch, type(platform_os)),
+        )
+        return key, (platform_os.major, platform_os.minor)
+    return (spec.implementation, (spec.platform.arch, platform_os)), ()
+
+
+def _group_covers(key: _GroupKey, other_key: _GroupKey) -> bool:
+    return all(part is None or part == other for part, other in zip(key, other_key))
+
+
+@lru_cache(maxsize=None)
+def _python_covers(outer: VersionSpecifier, inner: VersionSpecifier) -> bool:
+    return (inner & ~outer).is_empty()
+
+
+class EnvSpecSet:
+    """A set of target environments, ordered by which targets cover others.
+
+    A target covers another one if a resolution for it is also valid for the
+    other: they have the same implementation, architecture and OS family, its
+    OS version is lower or equal, and its python requirement includes the
+    other's. A target without an implementation or a platform matches any
+    implementation or platform. The targets are indexed by (implementation,
+    arch, OS family) and sorted by OS version, so that only the lower targets
+    of the groups matching a target are compared.
+
+    Args:
+        env_specs: The target environments.
+    """
+
+    def __init__(self, env_specs: Iterable[EnvSpec]) -> None:
+        self.env_specs = tuple(dict.fromkeys(env_specs))
+        # Group -> (OS versions, targets), sorted by OS version
+        self._groups: dict[_GroupKey, tuple[list[tuple[int, ...]], list[EnvSpec]]] = {}
+        for spec in sorted(self.env_specs, key=lambda spec: _split_spec(spec)[1]):
+            key, version = _split_spec(spec)
+            versions, specs = self._groups.setdefault(key, ([], []))
+            versions.append(version)
+            specs.append(spec)
+
+    def __len__(self) -> int:
+        return len(self.env_specs)
+
+    def __iter__(self) -> Iterator[EnvSpec]:
+        return iter(self.env_specs)
+
+    def __contains__(self, spec: Any) -> bool:
+        return spec in self.env_specs
+
+    @staticmethod
+    def covers(spec: EnvSpec, other: EnvSpec) -> bool:
+        """Return True if `spec` covers `other`."""
+        key, version = _split_spec(spec)
+        other_key, other_version = _split_spec(other)
+        return (
+            _group_covers(key, other_key)
+            and (key[1] is None or version <= other_version)
+            and _python_covers(spec.requires_python, other.requires_python)
+        )
+
+    def _lower_candidates(self, spec: EnvSpec) -> Iterator[EnvSpec]:
+        """The targets whose group and OS version may cover the given one."""
+        key, version = _split_spec(spec)
+        for group_key, (versions, specs) in self._groups.items():
+            if _group_covers(group_key, key):
+                # Targets without a platform have no OS version and come first
+                yield from specs[: bisect.bisect_right(versions, version)]
+
+    def covering(self, spec: EnvSpec) -> list[EnvSpec]:
+        """Return the targets of the set that cover the given one."""
+        return [
+            candidate
+            for candidate in self._lower_candidates(spec)
+            if _python_covers(candidate.requires_python, spec.requires_python)
+        ]
+
+    def covered(self, spec: EnvSpec) -> list[EnvSpec]:
+        """Return the targets of the set covered by the given one."""
+        key, version = _split_spec(spec)
+        result: list[EnvSpec] = []
+        for group_key, (versions, specs) in self._groups.items():
+            if not _group_covers(key, group_key):
+                continue
+            start = 0 if key[1] is None else bisect.bisect_left(versions, version)
+            result.extend(
+                candidate
+                for candidate in specs[start:]
+                if _python_covers(spec.requires_python, candidate.requires_python)
+            )
+        return result
+
+    def minimal_cover(self) -> list[EnvSpec]:
+        """Return the smallest subset of targets that cover all the targets.
+
+        These are the targets that no other target covers, keeping the first
+        one of the targets that cover each other. The targets keep their order.
+        """
+        kept: set[EnvSpec] = set()
+        for specs in [specs for _, specs in self._groups.values()]:
+            for spec in specs:
+                if not any(
+                    self._is_dominated_by(spec, other, other in kept)
+                    for other in self._lower_candidates(spec)
+                    if other is not spec
+                ):
+                    kept.add(spec)
+        return [spec for spec in self.env_specs if spec in kept]
+
+    @staticmethod
+    def _is_dominated_by(spec: EnvSpec, other: EnvSpec, other_kept: bool) -> bool:
+        # The group of `other` matches and its OS version is lower or equal
+        if not _python_covers(other.requires_python, spec.requires_python):
+            return False
+        # Of the targets covering each other, only the first one is kept
+        return other_kept or not EnvSpecSet.covers(spec, other)
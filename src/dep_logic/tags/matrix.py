@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Tuple
+
+from .tags import EnvSpec, WheelTags, parse_wheel_tags
+
+if TYPE_CHECKING:
+    from ..specifiers import VersionSpecifier
+    from .tags import Implementation
+
+_Compatibility = Tuple[int, int, int, int]
+
+
+class WheelCompatMatrix:
+    """Check wheels against many target environments at once.
+
+    The targets are indexed by the platform tags they accept, and by their
+    python requirement and implementation, which are all the python and abi
+    tags depend on. Checking a wheel looks up each of its tags once instead
+    of evaluating the wheel for every target, and wheels with the same tags
+    share the result.
+
+    Args:
+        env_specs: The target environments.
+    """
+
+    def __init__(self, env_specs: Iterable[EnvSpec]) -> None:
+        self.env_specs = tuple(dict.fromkeys(env_specs))
+        # Platform tag -> {target index: priority}
+        self._platform_index: dict[str, dict[int, int]] = {}
+        # Targets that accept all platforms
+        self._unrestricted: list[int] = []
+        self._python_groups: dict[
+            tuple[VersionSpecifier, Implementation | None], list[int]
+        ] = {}
+        # (python tag, abi tag) -> {target index: python compatibility}
+        self._python_index: dict[tuple[str, str], dict[int, tuple[int, int, int]]] = {}
+        self._results: dict[WheelTags, dict[EnvSpec, _Compatibility]] = {}
+        for index, spec in enumerate(self.env_specs):
+            if spec.platform is None:
+                self._unrestricted.append(index)
+            else:
+                for tag, priority in spec._platform_ranks.items():
+                    self._platform_index.setdefault(tag, {})[index] = priority
+            self._python_groups.setdefault(
+                (spec.requires_python, spec.implementation), []
+            ).append(index)
+
+    def _python_compatibility(
+        self, python_tag: str, abi_tag: str
+    ) -> dict[int, tuple[int, int, int]]:
+        key = (python_tag, abi_tag)
+        if (result := self._python_index.get(key)) is None:
+            result = self._python_index[key] = {}
+            for indexes in self._python_groups.values():
+                compat = self.env_specs[indexes[0]]._evaluate_python(*key)
+                if compat is not None:
+                    result.update(dict.fromkeys(indexes, compat))
+        return result
+
+    def compatibility(self, wheel_filename: str) -> dict[EnvSpec, _Compatibility]:
+        """Return the targets that can install the wheel, with the same
+        compatibility as `EnvSpec.wheel_compatibility` returns for them.
+
+        Raises:
+            InvalidWheelFilename: if the filename is not a valid wheel filename.
+        """
+        wheel_tags = parse_wheel_tags(wheel_filename)
+        if (result := self._results.get(wheel_tags)) is None:
+            result = self._results[wheel_tags] = self._compatibility(wheel_tags)
+        return dict(result)
+
+    def _compatibility(self, wheel_tags: WheelTags) -> dict[EnvSpec, _Compatibility]:
+        platform_compat = dict.fromkeys(self._unrestricted, -1)
+        for tag in wheel_tags.platform:
+            for index, priority in self._platform_index.get(tag, {}).items():
+                if priority > platform_compat.get(index, 0):
+                    platform_compat[index] = priority
+        if not platform_compat:
+            return {}
+        python_compat: dict[int, tuple[int, int, int]] = {}
+        for python_tag in wheel_tags.python:
+            for abi_tag in wheel_tags.abi:
+                for index, compat in self._python_compatibility(
+                    python_tag, abi_tag
+                ).items():
+                    if index not in platform_compat:
+                        continue
+                    if index not in python_compat or compat > python_compat[index]:
+                        python_compat[index] = compat
+        return {
+            self.env_specs[index]: (*python_compat[index], platform_compat[index])
+            for index in sorted(python_compat)
+        }
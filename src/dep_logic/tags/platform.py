@@ -6,8 +6,8 @@ import struct
 import sys
 from dataclasses import dataclass
 from enum import Enum
-from functools import cached_property
-from typing import TYPE_CHECKING
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, TypeVar, cast
 
 from . import os
 
@@ -23,6 +23,9 @@ _platform_major_minor_re = re.compile(
     r"(?P<os>manylinux|macos|musllinux)_(?P<major>\d+?)_(?P<minor>\d+?)_(?P<arch>[a-z0-9_]+)$"
 )
 
+_P = TypeVar("_P", bound="Platform")
+_instances: dict[tuple[type[Platform], os.Os, Arch], Platform] = {}
+
 _os_mapping = {
     "freebsd": os.FreeBsd,
     "netbsd": os.NetBsd,
@@ -38,6 +41,14 @@ class Platform:
     os: os.Os
     arch: Arch
 
+    def __new__(cls, os: os.Os, arch: Arch) -> Self:
+        # Equal platforms are the same instance, so that their cached tags
+        # are shared.
+        key = (cls, os, arch)
+        if (instance := _instances.get(key)) is None:
+            instance = _instances.setdefault(key, super().__new__(cls))
+        return cast("Self", instance)
+
     @classmethod
     def parse(cls, platform: str) -> Self:
         """Parse a platform string (e.g., `linux_x86_64`, `macosx_10_9_x86_64`, or `win_amd64`)
@@ -91,6 +102,14 @@ class Platform:
             except ValueError as e:
                 raise PlatformError(f"Unsupported platform {platform}") from e
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        # The compatible tags are computed again on load
+        return _restore_platform, (
+            type(self.os),
+            tuple(vars(self.os).values()),
+            self.arch.value,
+        )
+
     def __str__(self) -> str:
         if isinstance(self.os, os.Windows) and self.arch == Arch.X86_64:
             return "windows_amd64"
@@ -100,7 +119,15 @@ class Platform:
 
     @classmethod
     def current(cls) -> Self:
-        """Return the current platform."""
+        """Return the current platform.
+
+        It is detected once per process, call `dep_logic.tags.refresh_current()`
+        to detect it again.
+        """
+        return _current_platform(cls)
+
+    @classmethod
+    def _detect_current(cls) -> Self:
         import platform
         import sysconfig
 
@@ -180,100 +207,32 @@ class Platform:
         ]
 
     @cached_property
-    def compatible_tags(self) -> list[str]:
+    def compatible_tags(self) -> tuple[str, ...]:
         """Returns the compatible tags for the current [`Platform`] (e.g., `manylinux_2_17`,
         `macosx_11_0_arm64`, or `win_amd64`).
 
         We have two cases: Actual platform specific tags (including "merged" tags such as universal2)
         and "any".
 
-        Bit of a mess, needs to be cleaned up.
+        The tags are built from static tables for each operating system family,
+        and computed once per platform as platforms are interned.
         """
-        os_ = self.os
-        arch = self.arch
-        platform_tags: list[str] = []
-        if isinstance(os_, os.Manylinux):
-            if (min_minor := arch.get_minimum_manylinux_minor()) is not None:
-                for minor in range(os_.minor, min_minor - 1, -1):
-                    platform_tags.append(f"manylinux_{os_.major}_{minor}_{arch}")
-                    # Support legacy manylinux tags with lower priority
-                    # <https://peps.python.org/pep-0600/#legacy-manylinux-tags>
-                    if minor == 12:
-                        platform_tags.append(f"manylinux2010_{arch}")
-                    if minor == 17:
-                        platform_tags.append(f"manylinux2014_{arch}")
-                    if minor == 5:
-                        platform_tags.append(f"manylinux1_{arch}")
-            # Non-manylinux is lowest priority
-            # <https://github.com/pypa/packaging/blob/fd4f11139d1c884a637be8aa26bb60a31fbc9411/packaging/tags.py#L444>
-            platform_tags.append(f"linux_{arch}")
-        elif isinstance(os_, os.Musllinux):
-            platform_tags.append(f"linux_{arch}")
-            for minor in range(1, os_.minor + 1):
-                # musl 1.1 is the lowest supported version in musllinux
-                platform_tags.append(f"musllinux_{os_.major}_{minor}_{arch}")
-        elif isinstance(os_, os.Macos) and arch == Arch.X86_64:
-            if os_.major == 10:
-                for minor in range(os_.minor, 3, -1):
-                    for binary_format in arch.get_mac_binary_formats():
-                        platform_tags.append(f"macosx_10_{minor}_{binary_format}")
-            elif isinstance(os_.major, int) and os_.major >= 11:
-                # Starting with Mac OS 11, each yearly release bumps the major version number.
-                # The minor versions are now the midyear updates.
-                for major in range(os_.major, 10, -1):
-                    for binary_format in arch.get_mac_binary_formats():
-                        platform_tags.append(f"macosx_{major}_0_{binary_format}")
-                # The "universal2" binary format can have a macOS version earlier than 11.0
-                # when the x86_64 part of the binary supports that version of macOS.
-                for minor in range(16, 3, -1):
-                    for binary_format in arch.get_mac_binary_formats():
-                        platform_tags.append(f"macosx_10_{minor}_{binary_format}")
-            else:
-                raise PlatformError(f"Unsupported macOS version {os_.major}")
-        elif isinstance(os_, os.Macos) and arch == Arch.Aarch64:
-            # Starting with Mac OS 11, each yearly release bumps the major version number.
-            # The minor versions are now the midyear updates.
-            for major in range(os_.major, 10, -1):
-                for binary_format in arch.get_mac_binary_formats():
-                    platform_tags.append(f"macosx_{major}_0_{binary_format}")
-            # The "universal2" binary format can have a macOS version earlier than 11.0
-            # when the x86_64 part of the binary supports that version of macOS.
-            for minor in range(16, 3, -1):
-                platform_tags.append(f"macosx_10_{minor}_universal2")
-        elif isinstance(os_, os.Windows):
-            if arch == Arch.X86:
-                platform_tags.append("win32")
-            elif arch == Arch.X86_64:
-                platform_tags.append("win_amd64")
-            elif arch == Arch.Aarch64:
-                platform_tags.append("win_arm64")
-            else:
-                raise PlatformError(f"Unsupported Windows architecture {arch}")
-        elif isinstance(
-            os_, (os.FreeBsd, os.NetBsd, os.OpenBsd, os.Dragonfly, os.Haiku)
-        ):
-            release = os_.release.replace(".", "_").replace("-", "_")
-            platform_tags.append(f"{str(os_).lower()}_{release}_{arch}")
-        elif isinstance(os_, os.Illumos):
-            # See https://github.com/python/cpython/blob/46c8d915715aa2bd4d697482aa051fe974d440e1/Lib/sysconfig.py#L722-L730
-            try:
-                major, other = os_.release.split("_", 1)
-            except ValueError:
-                platform_tags.append(f"{str(os_).lower()}_{os_.release}_{arch}")
-            else:
-                major_ver = int(major)
-                if major_ver >= 5:
-                    # SunOS 5 == Solaris 2
-                    release = f"{major_ver - 3}_{other}"
-                    arch = f"{arch}_64bit"
-                    platform_tags.append(f"solaris_{release}_{arch}")
-        elif isinstance(os_, os.Generic):
-            platform_tags.append(f"{os_}_{arch}")
-        else:
-            raise PlatformError(
-                f"Unsupported operating system and architecture combination: {os_} {arch}"
-            )
-        return platform_tags
+        for os_class in type(self.os).__mro__:
+            if (builder := _TAG_BUILDERS.get(os_class)) is not None:
+                return tuple(builder(self.os, self.arch))
+        raise PlatformError(
+            "Unsupported operating system and architecture combination: "
+            f"{self.os} {self.arch}"
+        )
+
+    @cached_property
+    def _tag_ranks(self) -> dict[str, int]:
+        """The priority of each compatible platform tag, the higher the better."""
+        platform_tags = [*self.compatible_tags, "any"]
+        ranks: dict[str, int] = {}
+        for index, tag in enumerate(platform_tags):
+            ranks.setdefault(tag, len(platform_tags) - index)
+        return ranks
 
     @cached_property
     def os_name(self) -> str:
@@ -385,3 +344,115 @@ class Arch(Enum):
         if arch == "arm64":
             return cls.Aarch64
         return cls(arch)
+
+
+_MANYLINUX_MIN_MINORS = {arch: arch.get_minimum_manylinux_minor() for arch in Arch}
+# Legacy manylinux tags, with a lower priority than the equivalent new tags
+# <https://peps.python.org/pep-0600/#legacy-manylinux-tags>
+_MANYLINUX_LEGACY_TAGS = {5: "manylinux1", 12: "manylinux2010", 17: "manylinux2014"}
+_MAC_BINARY_FORMATS = {arch: tuple(arch.get_mac_binary_formats()) for arch in Arch}
+# The "universal2" binary format can have a macOS version earlier than 11.0
+# when the x86_64 part of the binary supports that version of macOS.
+_MACOS_10_TAGS = {
+    Arch.X86_64: tuple(
+        f"macosx_10_{minor}_{binary_format}"
+        for minor in range(16, 3, -1)
+        for binary_format in _MAC_BINARY_FORMATS[Arch.X86_64]
+    ),
+    Arch.Aarch64: tuple(f"macosx_10_{minor}_universal2" for minor in range(16, 3, -1)),
+}
+_WINDOWS_TAGS = {Arch.X86: "win32", Arch.X86_64: "win_amd64", Arch.Aarch64: "win_arm64"}
+
+
+def _manylinux_tags(os_: os.Manylinux, arch: Arch) -> Iterator[str]:
+    if (min_minor := _MANYLINUX_MIN_MINORS[arch]) is not None:
+        for minor in range(os_.minor, min_minor - 1, -1):
+            yield f"manylinux_{os_.major}_{minor}_{arch}"
+            if (legacy := _MANYLINUX_LEGACY_TAGS.get(minor)) is not None:
+                yield f"{legacy}_{arch}"
+    # Non-manylinux is lowest priority
+    # <https://github.com/pypa/packaging/blob/fd4f11139d1c884a637be8aa26bb60a31fbc9411/packaging/tags.py#L444>
+    yield f"linux_{arch}"
+
+
+def _musllinux_tags(os_: os.Musllinux, arch: Arch) -> Iterator[str]:
+    yield f"linux_{arch}"
+    # musl 1.1 is the lowest supported version in musllinux
+    for minor in range(1, os_.minor + 1):
+        yield f"musllinux_{os_.major}_{minor}_{arch}"
+
+
+def _macos_tags(os_: os.Macos, arch: Arch) -> Iterator[str]:
+    if arch not in _MACOS_10_TAGS:
+        raise PlatformError(
+            f"Unsupported operating system and architecture combination: {os_} {arch}"
+        )
+    binary_formats = _MAC_BINARY_FORMATS[arch]
+    if arch == Arch.X86_64:
+        if os_.major == 10:
+            for minor in range(os_.minor, 3, -1):
+                for binary_format in binary_formats:
+                    yield f"macosx_10_{minor}_{binary_format}"
+            return
+        if not isinstance(os_.major, int) or os_.major < 11:
+            raise PlatformError(f"Unsupported macOS version {os_.major}")
+    # Starting with Mac OS 11, each yearly release bumps the major version number.
+    # The minor versions are now the midyear updates.
+    for major in range(os_.major, 10, -1):
+        for binary_format in binary_formats:
+            yield f"macosx_{major}_0_{binary_format}"
+    yield from _MACOS_10_TAGS[arch]
+
+
+def _windows_tags(os_: os.Windows, arch: Arch) -> Iterator[str]:
+    if arch not in _WINDOWS_TAGS:
+        raise PlatformError(f"Unsupported Windows architecture {arch}")
+    yield _WINDOWS_TAGS[arch]
+
+
+def _bsd_tags(os_: os.FreeBsd, arch: Arch) -> Iterator[str]:
+    release = os_.release.replace(".", "_").replace("-", "_")
+    yield f"{str(os_).lower()}_{release}_{arch}"
+
+
+def _illumos_tags(os_: os.Illumos, arch: Arch) -> Iterator[str]:
+    # See https://github.com/python/cpython/blob/46c8d915715aa2bd4d697482aa051fe974d440e1/Lib/sysconfig.py#L722-L730
+    try:
+        major, other = os_.release.split("_", 1)
+    except ValueError:
+        yield f"{str(os_).lower()}_{os_.release}_{arch}"
+    else:
+        major_ver = int(major)
+        if major_ver >= 5:
+            # SunOS 5 == Solaris 2
+            yield f"solaris_{major_ver - 3}_{other}_{arch}_64bit"
+
+
+def _generic_tags(os_: os.Generic, arch: Arch) -> Iterator[str]:
+    yield f"{os_}_{arch}"
+
+
+_TAG_BUILDERS: dict[type[os.Os], Callable[[Any, Arch], Iterable[str]]] = {
+    os.Manylinux: _manylinux_tags,
+    os.Musllinux: _musllinux_tags,
+    os.Macos: _macos_tags,
+    os.Windows: _windows_tags,
+    os.FreeBsd: _bsd_tags,
+    os.NetBsd: _bsd_tags,
+    os.OpenBsd: _bsd_tags,
+    os.Dragonfly: _bsd_tags,
+    os.Haiku: _bsd_tags,
+    os.Illumos: _illumos_tags,
+    os.Generic: _generic_tags,
+}
+
+
+@lru_cache(maxsize=None)
+def _current_platform(cls: type[_P]) -> _P:
+    return cls._detect_current()
+
+
+def _restore_platform(
+    os_class: type[os.Os], os_fields: tuple[Any, ...], arch: str
+) -> Platform:
+    return Platform(os_class(*os_fields), Arch(arch))
@@ -1,21 +1,72 @@
 from __future__ import annotations
 
+import heapq
+import itertools
+import operator
+import re
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import IntEnum, auto
+from functools import cached_property, lru_cache
 from platform import python_implementation
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, NamedTuple, Sequence, TypeVar
 
+from packaging.markers import default_environment
+from packaging.version import VERSION_PATTERN
+
+from dep_logic.markers.base import MARKERS_ALLOWING_SET, BaseMarker
+from dep_logic.markers.extras import partial_evaluate
+from dep_logic.markers.lazy import LazyMarker
 from dep_logic.specifiers.range import RangeSpecifier
 
-from ..specifiers import InvalidSpecifier, VersionSpecifier, parse_version_specifier
-from .platform import Platform
+from ..specifiers import (
+    BaseSpecifier,
+    InvalidSpecifier,
+    VersionSpecifier,
+    parse_version_specifier,
+)
+from . import os
+from .platform import Platform, _current_platform
 
 if TYPE_CHECKING:
     from typing import Literal, Self
 
 
-def parse_wheel_tags(filename: str) -> tuple[list[str], list[str], list[str]]:
+# The markers fixed by a platform, the release and version are unknown even
+# if the target runs on the host platform
+_PLATFORM_MARKERS = (
+    "os_name",
+    "platform_machine",
+    "platform_system",
+    "sys_platform",
+)
+# The OS families whose platform markers are known, only os_name is fixed for
+# the other POSIX systems
+_MARKED_OS = (os.Manylinux, os.Musllinux, os.Windows, os.Macos)
+_MARKER_NAMES = frozenset([*default_environment(), "extra", *MARKERS_ALLOWING_SET])
+
+
+class WheelTags(NamedTuple):
+    """The python, abi and platform tags of a wheel."""
+
+    python: tuple[str, ...]
+    abi: tuple[str, ...]
+    platform: tuple[str, ...]
+
+
+_wheel_name_re = re.compile(r"[a-z0-9](?:[a-z0-9._]*[a-z0-9])?", re.IGNORECASE)
+_wheel_version_re = re.compile(VERSION_PATTERN, re.VERBOSE | re.IGNORECASE)
+_wheel_tag_re = re.compile(r"[a-z0-9_]+", re.IGNORECASE)
+
+
+def parse_wheel_tags(filename: str) -> WheelTags:
+    """Parse the tags of a wheel filename.
+
+    Equal tag sets are returned as the same `WheelTags` instance.
+
+    Raises:
+        InvalidWheelFilename: if the filename is not a valid wheel filename.
+    """
     if not filename.endswith(".whl"):
         raise InvalidWheelFilename(
             f"Invalid wheel filename (extension must be '.whl'): {filename}"
@@ -28,9 +79,35 @@ def parse_wheel_tags(filename: str) -> tuple[list[str], list[str], list[str]]:
             f"Invalid wheel filename (wrong number of parts): {filename}"
         )
 
-    parts = filename.split("-")
-    python, abi, platform = parts[-3:]
-    return python.split("."), abi.split("."), platform.split(".")
+    name, version, *build, python, abi, platform = filename.split("-")
+    if _wheel_name_re.fullmatch(name) is None:
+        raise InvalidWheelFilename(
+            f"Invalid wheel filename (invalid project name): {filename}"
+        )
+    if _wheel_version_re.fullmatch(version) is None:
+        raise InvalidWheelFilename(
+            f"Invalid wheel filename (invalid version): {filename}"
+        )
+    if build and not build[0][:1].isdigit():
+        raise InvalidWheelFilename(
+            f"Invalid wheel filename (build number must start with a digit): {filename}"
+        )
+    tags = _parse_tags(python, abi, platform)
+    if tags is None:
+        raise InvalidWheelFilename(f"Invalid wheel filename (invalid tags): {filename}")
+    return tags
+
+
+@lru_cache(maxsize=None)
+def _parse_tags(python: str, abi: str, platform: str) -> WheelTags | None:
+    python_tags, abi_tags, platform_tags = (
+        tuple(sys.intern(tag) for tag in part.split("."))
+        for part in (python, abi, platform)
+    )
+    for tag in itertools.chain(python_tags, abi_tags, platform_tags):
+        if _wheel_tag_re.fullmatch(tag) is None:
+            return None
+    return WheelTags(python_tags, abi_tags, platform_tags)
 
 
 def _ensure_version_specifier(spec: str) -> VersionSpecifier:
@@ -77,6 +154,13 @@ class Implementation:
 
     @classmethod
     def current(cls) -> Self:
+        """Return the implementation of the running interpreter, it is
+        detected once per process.
+        """
+        return _current_implementation(cls)
+
+    @classmethod
+    def _detect_current(cls) -> Self:
         import sysconfig
 
         implementation = python_implementation()
@@ -108,6 +192,10 @@ class EnvSpec:
     requires_python: VersionSpecifier
     platform: Platform | None = None
     implementation: Implementation | None = None
+    # The results of _evaluate_python, the same tags recur across wheels
+    _python_results: dict[tuple[str, str], tuple[int, int, int] | None] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def __str__(self) -> str:
         parts = [str(self.requires_python)]
@@ -117,6 +205,9 @@ class EnvSpec:
             parts.append(self.implementation.name)
         return f"({', '.join(parts)})"
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), (self.requires_python, self.platform, self.implementation)
+
     def as_dict(self) -> dict[str, str | bool]:
         result: dict[str, str | bool] = {"requires_python": str(self.requires_python)}
         if self.platform is not None:
@@ -144,6 +235,15 @@ class EnvSpec:
 
     @classmethod
     def current(cls) -> Self:
+        """Return the environment of the running interpreter.
+
+        It is detected once per process, call `refresh_current()` to detect it
+        again.
+        """
+        return _current_env_spec(cls)
+
+    @classmethod
+    def _detect_current(cls) -> Self:
         # XXX: Strip pre-release and post-release tags
         python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
         requires_python = _ensure_version_specifier(f"=={python_version}")
@@ -155,6 +255,18 @@ class EnvSpec:
         self, python_tag: str, abi_tag: str
     ) -> tuple[int, int, int] | None:
         """Return a tuple of (major, minor, abi) if the wheel is compatible with the environment, or None otherwise."""
+        key = (python_tag, abi_tag)
+        try:
+            return self._python_results[key]
+        except KeyError:
+            result = self._python_results[key] = self._compute_python_compatibility(
+                python_tag, abi_tag
+            )
+            return result
+
+    def _compute_python_compatibility(
+        self, python_tag: str, abi_tag: str
+    ) -> tuple[int, int, int] | None:
         impl, major, minor = python_tag[:2], python_tag[2:3], python_tag[3:]
         if self.implementation is not None and impl not in [
             self.implementation.short,
@@ -204,20 +316,29 @@ class EnvSpec:
             return None
         return (int(major), int(minor or 0), 0 if abi_impl == "none" else 2)
 
+    @property
+    def _platform_ranks(self) -> dict[str, int]:
+        assert self.platform is not None
+        return self.platform._tag_ranks
+
     def _evaluate_platform(self, platform_tag: str) -> int | None:
         if self.platform is None:
             return -1
-        platform_tags = [*self.platform.compatible_tags, "any"]
-        if platform_tag not in platform_tags:
-            return None
-        return len(platform_tags) - platform_tags.index(platform_tag)
+        return self._platform_ranks.get(platform_tag)
 
     def compatibility(
         self,
-        wheel_python_tags: list[str],
-        wheel_abi_tags: list[str],
-        wheel_platform_tags: list[str],
+        wheel_python_tags: Sequence[str],
+        wheel_abi_tags: Sequence[str],
+        wheel_platform_tags: Sequence[str],
     ) -> tuple[int, int, int, int] | None:
+        # Platform tags are plain lookups, check them before the python tags
+        platform_compat = max(
+            filter(None, map(self._evaluate_platform, wheel_platform_tags)),
+            default=None,
+        )
+        if platform_compat is None:
+            return None
         python_abi_combinations = (
             (python_tag, abi_tag)
             for python_tag in wheel_python_tags
@@ -231,12 +352,6 @@ class EnvSpec:
         )
         if python_compat is None:
             return None
-        platform_compat = max(
-            filter(None, map(self._evaluate_platform, wheel_platform_tags)),
-            default=None,
-        )
-        if platform_compat is None:
-            return None
         return (*python_compat, platform_compat)
 
     def wheel_compatibility(
@@ -249,6 +364,97 @@ class EnvSpec:
             wheel_python_tags, wheel_abi_tags, wheel_platform_tags
         )
 
+    def _compatible_wheels(
+        self, filenames: Iterable[str]
+    ) -> Iterator[tuple[tuple[int, int, int, int], str]]:
+        for filename in filenames:
+            try:
+                wheel_tags = parse_wheel_tags(filename)
+            except InvalidWheelFilename:
+                continue
+            if (compat := self.compatibility(*wheel_tags)) is not None:
+                yield compat, filename
+
+    def rank(self, filenames: Iterable[str], limit: int | None = None) -> list[str]:
+        """Return the wheels compatible with the environment, the best first.
+
+        Filenames that are not valid wheel filenames are ignored. Wheels with
+        the same compatibility keep their order.
+
+        Args:
+            filenames: The filenames to rank.
+            limit: The maximum number of wheels to return.
+        """
+        wheels = self._compatible_wheels(filenames)
+        key = operator.itemgetter(0)
+        if limit is None:
+            ranked = sorted(wheels, key=key, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, wheels, key=key)
+        return [filename for _, filename in ranked]
+
+    def select_best(self, filenames: Iterable[str]) -> str | None:
+        """Return the best wheel for the environment, or None if no wheel is
+        compatible.
+        """
+        best = self.rank(filenames, limit=1)
+        return best[0] if best else None
+
+    @cached_property
+    def _marker_environment(self) -> dict[str, str | set[str]]:
+        """The marker values fixed by the target, without the python versions
+        which are given as a range.
+        """
+        environment: dict[str, str | set[str]] = {}
+        platform = self.platform
+        if platform is not None and isinstance(platform.os, _MARKED_OS):
+            environment.update(
+                (name, getattr(platform, name)) for name in _PLATFORM_MARKERS
+            )
+        elif platform is not None and not isinstance(platform.os, os.Generic):
+            environment["os_name"] = platform.os_name
+        if self.implementation is not None:
+            environment.update(
+                implementation_name=self.implementation.name,
+                platform_python_implementation=self.implementation.capitalized,
+            )
+        return environment
+
+    @cached_property
+    def _free_marker_names(self) -> frozenset[str]:
+        """The marker names whose value is not fixed by the target."""
+        return _MARKER_NAMES.difference(self._marker_environment)
+
+    def _marker_python_range(self, marker: BaseMarker) -> BaseSpecifier:
+        """The python versions for which the marker may be true on the target."""
+        return partial_evaluate(
+            marker, self._marker_environment, self._free_marker_names
+        ).python_range()
+
+    def satisfies(self, marker: BaseMarker) -> bool:
+        """Return True if the marker may be true on the target.
+
+        The marker is evaluated for the whole range of ``requires_python``
+        instead of a single python version, and it is satisfied if it is
+        true for some version of the range. Values that the target doesn't
+        fix, such as the platform of a target without one, may take any value
+        instead of the values of the running interpreter.
+        """
+        return not (self._marker_python_range(marker) & self.requires_python).is_empty()
+
+    def evaluate_marker(self, marker: BaseMarker) -> bool | None:
+        """Evaluate the marker on the target, for the whole range of
+        ``requires_python``.
+
+        Returns:
+            True if the marker is true for every python version of the range
+            and every value of the variables the target doesn't fix, False if
+            it is never true, and None if it depends on them.
+        """
+        return partial_evaluate(
+            marker, self._marker_environment, self._free_marker_names
+        ).evaluate_python_range(self.requires_python)
+
     def markers(self) -> dict[str, str]:
         result = {}
         if (
@@ -297,3 +503,47 @@ class EnvSpec:
             else:
                 return EnvCompatibility.HIGHER
         return EnvCompatibility.LOWER_OR_EQUAL
+
+
+def filter_targets(marker: BaseMarker, env_specs: Iterable[EnvSpec]) -> list[EnvSpec]:
+    """Return the targets that satisfy the marker, see `EnvSpec.satisfies`.
+
+    The marker is only evaluated once for the targets with the same platform
+    and implementation.
+    """
+    if isinstance(marker, LazyMarker):
+        marker = marker.resolve()
+    python_ranges: dict[
+        tuple[Platform | None, Implementation | None], BaseSpecifier
+    ] = {}
+    result: list[EnvSpec] = []
+    for spec in env_specs:
+        key = (spec.platform, spec.implementation)
+        if (python_range := python_ranges.get(key)) is None:
+            python_range = python_ranges[key] = spec._marker_python_range(marker)
+        if not (python_range & spec.requires_python).is_empty():
+            result.append(spec)
+    return result
+
+
+_I = TypeVar("_I", bound=Implementation)
+_E = TypeVar("_E", bound=EnvSpec)
+
+
+@lru_cache(maxsize=None)
+def _current_implementation(cls: type[_I]) -> _I:
+    return cls._detect_current()
+
+
+@lru_cache(maxsize=None)
+def _current_env_spec(cls: type[_E]) -> _E:
+    return cls._detect_current()
+
+
+def refresh_current() -> None:
+    """Forget the detected current platform, implementation and environment,
+    so that they are detected again on the next call to ``current()``.
+    """
+    _current_platform.cache_clear()
+    _current_implementation.cache_clear()
+    _current_env_spec.cache_clear()
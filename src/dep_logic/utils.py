@@ -122,18 +122,20 @@ def dnf(marker: BaseMarker) -> BaseMarker:
 
 
 def intersection(*markers: BaseMarker) -> BaseMarker:
+    from dep_logic.markers.lazy import resolve_lazy
     from dep_logic.markers.multi import MultiMarker
 
-    return dnf(MultiMarker(*markers))
+    return dnf(MultiMarker(*resolve_lazy(markers)))
 
 
 def union(*markers: BaseMarker) -> BaseMarker:
+    from dep_logic.markers.lazy import resolve_lazy
     from dep_logic.markers.multi import MultiMarker
     from dep_logic.markers.union import MarkerUnion
 
     # Sometimes normalization makes it more complicate instead of simple
     # -> choose candidate with the least complexity
-    unnormalized: BaseMarker = MarkerUnion(*markers)
+    unnormalized: BaseMarker = MarkerUnion(*resolve_lazy(markers))
     while (
         isinstance(unnormalized, (MultiMarker, MarkerUnion))
         and len(unnormalized.markers) == 1
@@ -170,12 +172,9 @@ def get_reflect_op(op: str) -> str:
 
 
 class OrderedSet(AbstractSet[T]):
+    # Backed by a dict to keep the insertion order with hashed lookups
     def __init__(self, iterable: Iterable[T]) -> None:
-        self._data: list[T] = []
-        for item in iterable:
-            if item in self._data:
-                continue
-            self._data.append(item)
+        self._data: dict[T, None] = dict.fromkeys(iterable)
 
     def __hash__(self) -> int:
         return self._hash()
@@ -190,7 +189,7 @@ class OrderedSet(AbstractSet[T]):
         return len(self._data)
 
     def peek(self) -> T:
-        return self._data[0]
+        return next(iter(self._data))
 
 
 def normalize_name(name: str) -> str:
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import itertools
+
+from dep_logic.markers import MarkerAccumulator, parse_marker
+
+EDGES = [
+    ('python_version >= "3.8"', 'sys_platform == "win32"'),
+    (
+        'python_version >= "3.9"',
+        'sys_platform == "win32" and platform_machine == "x86_64"',
+    ),
+    ("", 'sys_platform == "linux"'),
+    (
+        'implementation_name == "pypy"',
+        'python_version < "3.8" or sys_platform == "darwin"',
+    ),
+    ('python_version >= "3.8"', 'sys_platform == "linux"'),
+]
+
+
+def test_accumulator_matches_union() -> None:
+    accumulator = MarkerAccumulator()
+    expected = parse_marker("<empty>")
+    for parent, edge in EDGES:
+        marker = parse_marker(parent) & parse_marker(edge)
+        accumulator.add(marker)
+        expected |= marker
+
+    environments = [
+        {
+            "python_version": python,
+            "sys_platform": platform,
+            "platform_machine": machine,
+            "implementation_name": implementation,
+        }
+        for python, platform, machine, implementation in itertools.product(
+            ["3.7", "3.8", "3.10"],
+            ["win32", "linux", "darwin"],
+            ["x86_64", "arm64"],
+            ["cpython", "pypy"],
+        )
+    ]
+    for env in environments:
+        assert accumulator.marker.evaluate(env) is expected.evaluate(env)
+
+
+def test_accumulator_subsumption() -> None:
+    accumulator = MarkerAccumulator(
+        parse_marker('python_version >= "3.9" and sys_platform == "win32"')
+    )
+    assert not accumulator.add(
+        parse_marker(
+            'python_version >= "3.10" and sys_platform == "win32"'
+            ' and platform_machine == "x86_64"'
+        )
+    )
+    assert len(accumulator) == 1
+
+    assert accumulator.add(parse_marker('python_version >= "3.8"'))
+    assert accumulator.terms == (parse_marker('python_version >= "3.8"'),)
+    assert str(accumulator.marker) == 'python_version >= "3.8"'
+
+    assert not accumulator.add(parse_marker("<empty>"))
+    assert accumulator.add(parse_marker('python_version < "3.8"'))
+    assert len(accumulator) == 2
+    assert accumulator.marker.is_any()
+
+
+def test_accumulator_any() -> None:
+    accumulator = MarkerAccumulator(parse_marker('sys_platform == "linux"'))
+    assert accumulator.add(parse_marker(""))
+    assert accumulator.is_any()
+    assert accumulator.marker.is_any()
+    assert not accumulator.add(parse_marker('sys_platform == "win32"'))
+    assert str(MarkerAccumulator().marker) == "<empty>"
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import pickle
+
 import pytest
 
 from dep_logic.markers import parse_marker
+from dep_logic.markers.single import UndefinedComparison
+from dep_logic.specifiers import parse_version_specifier
 
 
 @pytest.mark.parametrize(
@@ -157,3 +161,167 @@ def test_only(marker: str, only: list[str], expected: str) -> None:
     m = parse_marker(marker)
 
     assert str(m.only(*only)) == expected
+
+
+@pytest.mark.parametrize(
+    "marker, environment, expected",
+    [
+        ('python_version >= "3.6"', {"python_version": "3.9"}, [((), ())]),
+        ('python_version >= "3.6"', {"python_version": "3.5"}, []),
+        (
+            'python_version >= "3.6" and (extra == "foo" or extra == "bar") or'
+            ' implementation_name == "pypy"',
+            {"python_version": "3.9", "implementation_name": "cpython"},
+            [(("foo",), ()), (("bar",), ())],
+        ),
+        (
+            'python_version >= "3.6" and (extra == "foo" or extra == "bar") or'
+            ' implementation_name == "pypy"',
+            {"python_version": "3.9", "implementation_name": "pypy"},
+            [((), ())],
+        ),
+        ('extra == "a" and extra == "b" or extra == "A"', None, [(("a",), ())]),
+        ('extra == "Foo.Bar" and extra != "baz"', None, [(("foo-bar",), ("baz",))]),
+        ('extra == "a" and extra != "a"', None, []),
+    ],
+)
+def test_extras_requirement(
+    marker: str,
+    environment: dict[str, str] | None,
+    expected: list[tuple[tuple[str, ...], tuple[str, ...]]],
+) -> None:
+    m = parse_marker(marker)
+
+    assert [
+        (tuple(sorted(term.required)), tuple(sorted(term.excluded)))
+        for term in m.extras_requirement(environment)
+    ] == expected
+
+
+@pytest.mark.parametrize(
+    "marker",
+    [
+        'extra in "a b"',
+        '"a" in extra',
+        'extra not in "a b"',
+        'sys_platform == "linux" and extra > "a"',
+    ],
+)
+def test_extras_requirement_unsupported_operator(marker: str) -> None:
+    with pytest.raises(UndefinedComparison, match="only == and != are supported"):
+        parse_marker(marker).extras_requirement({"sys_platform": "linux"})
+
+
+def test_extras_requirement_matches_evaluation() -> None:
+    m = parse_marker(
+        '(extra == "a" or extra == "b") and extra != "c" and sys_platform == "linux"'
+    )
+    terms = m.extras_requirement({"sys_platform": "linux"})
+
+    for selected in [(), ("a",), ("b", "c"), ("a", "b"), ("c",)]:
+        assert any(term.matches(selected) for term in terms) is m.evaluate(
+            {"extra": set(selected), "sys_platform": "linux"}
+        )
+
+
+@pytest.mark.parametrize(
+    "marker, expected",
+    [
+        ("", ""),
+        ("<empty>", "<empty>"),
+        ('sys_platform == "win32"', ""),
+        ('python_version >= "3.8"', ">=3.8"),
+        ('python_version > "3.8"', ">=3.9"),
+        ('python_version == "3.8"', "==3.8.*"),
+        ('python_full_version >= "3.8.1"', ">=3.8.1"),
+        ('python_version >= "3.8" and sys_platform == "win32"', ">=3.8"),
+        ('python_version >= "3.8" and python_full_version < "3.11.2"', ">=3.8,<3.11.2"),
+        ('python_version < "3.8" or sys_platform == "win32"', ""),
+        ('python_version < "3.6" or python_version >= "3.8"', "<3.6||>=3.8"),
+        (
+            'python_version >= "3.8" and extra == "foo" or python_version < "3.6"',
+            "<3.6||>=3.8",
+        ),
+        ('python_version >= "3.8" or python_version < "3.6"', "<3.6||>=3.8"),
+        ('python_version < "3.8" and python_version >= "3.9"', "<empty>"),
+        ('python_version < "3.8.1"', ""),
+    ],
+)
+def test_python_range(marker: str, expected: str) -> None:
+    m = parse_marker(marker)
+
+    assert str(m.python_range()) == expected
+    assert str(parse_marker(marker, lazy=True).python_range()) == expected
+
+
+def test_python_range_is_cached() -> None:
+    m = parse_marker('python_version >= "3.8" and python_full_version < "3.11.2"')
+
+    assert m.python_range() is m.python_range()
+
+
+def test_str_is_cached() -> None:
+    m = parse_marker(
+        'python_version >= "3.8" and (sys_platform == "win32" or os_name == "nt")'
+    )
+
+    assert str(m) is str(m)
+    assert all(str(child) is str(child) for child in m.markers)  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize(
+    "marker",
+    [
+        'python_version >= "3.8"',
+        '"tegra" in platform_release',
+        'python_version >= "3.8" and (sys_platform == "win32" or os_name == "nt")',
+        'python_version < "3.8" or python_full_version >= "3.9.1" and extra == "a"',
+    ],
+)
+def test_pickle(marker: str) -> None:
+    m = parse_marker(marker)
+    m.python_range()
+
+    restored = pickle.loads(pickle.dumps(m))
+    assert restored == m
+    assert str(restored) == str(m)
+    assert type(restored) is type(m)
+
+
+def test_pickle_shares_expressions() -> None:
+    m = parse_marker('sys_platform == "win32"')
+
+    assert pickle.loads(pickle.dumps(m)) is pickle.loads(pickle.dumps(m))
+
+
+@pytest.mark.parametrize(
+    "marker,python,expected",
+    [
+        ("", ">=3.8", True),
+        ("<empty>", ">=3.8", False),
+        ('python_version >= "3.9"', ">=3.9,<3.13", True),
+        ('python_version >= "3.10"', ">=3.9,<3.13", None),
+        ('python_version < "3.9"', ">=3.9", False),
+        ('python_version == "3.9"', ">=3.9.2,<3.10", True),
+        ('python_version in "3.8, 3.9"', ">=3.8,<3.10", True),
+        ('python_full_version >= "3.9.1"', ">=3.9,<3.10", None),
+        ('python_version >= "3.9" or python_version < "3.9"', "", True),
+        ('python_version >= "3.9" and sys_platform == "win32"', ">=3.9", None),
+        ('python_version < "3.9" and sys_platform == "win32"', ">=3.9", False),
+        ('python_version < "3.9" or sys_platform == "win32"', ">=3.9", None),
+        ('python_version >= "3.9" or sys_platform == "win32"', ">=3.9", True),
+        ('python_version > "3.9.1"', ">=3.10", None),
+    ],
+)
+def test_evaluate_python_range(marker: str, python: str, expected: bool | None) -> None:
+    spec = parse_version_specifier(python)
+    assert parse_marker(marker).evaluate_python_range(spec) is expected
+    assert parse_marker(marker, lazy=True).evaluate_python_range(spec) is expected
+
+
+def test_unpickle_cache_is_bounded() -> None:
+    from dep_logic.markers.single import _restore_expression
+    from dep_logic.specifiers.range import _restore_range
+
+    for cache in (_restore_expression, _restore_range):
+        assert cache.cache_info().maxsize is not None
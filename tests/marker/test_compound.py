@@ -779,3 +779,37 @@ def test_merging_python_version_and_python_full_version(
 
     union = parse_marker(m) | parse_marker(m2)
     assert str(union) == expected_union
+
+
+def test_marker_union_merges_equality_markers() -> None:
+    markers = [parse_marker(f'platform_machine == "m{i}"') for i in range(5)]
+    m = MarkerUnion.of(parse_marker('sys_platform == "linux"'), *markers)
+
+    assert str(m) == (
+        'sys_platform == "linux" or platform_machine == "m0" or '
+        'platform_machine == "m1" or platform_machine == "m2" or '
+        'platform_machine == "m3" or platform_machine == "m4"'
+    )
+    assert m.evaluate({"platform_machine": "m3", "sys_platform": "win32"})
+    assert not m.evaluate({"platform_machine": "m5", "sys_platform": "win32"})
+
+
+def test_multi_marker_merges_inequality_markers() -> None:
+    markers = [parse_marker(f'sys_platform != "p{i}"') for i in range(5)]
+    m = MultiMarker.of(*markers)
+
+    assert str(m) == (
+        'sys_platform != "p0" and sys_platform != "p1" and sys_platform != "p2" '
+        'and sys_platform != "p3" and sys_platform != "p4"'
+    )
+    assert m.evaluate({"sys_platform": "linux"})
+    assert not m.evaluate({"sys_platform": "p2"})
+
+
+def test_marker_union_equality_with_inverse_is_any() -> None:
+    m = parse_marker(
+        'platform_machine == "x86_64" or platform_machine == "AMD64" '
+        'or platform_machine != "AMD64"'
+    )
+
+    assert m.is_any()
@@ -4,7 +4,9 @@ import os
 
 import pytest
 
-from dep_logic.markers import parse_marker
+from dep_logic.markers import MarkerExpression, parse_marker
+from dep_logic.markers.multi import MultiMarker
+from dep_logic.markers.union import MarkerUnion
 
 
 @pytest.mark.parametrize(
@@ -200,3 +202,228 @@ def test_extras_and_dependency_groups_disallowed(variable: str) -> None:
 
     with pytest.raises(KeyError):
         marker.evaluate(context="requirement")
+
+
+def test_compiled_marker_keeps_short_circuit_before_failing_leaf() -> None:
+    from dep_logic.markers import CompiledMarker
+
+    marker = parse_marker('python_full_version < "3.0" and extra == "foo"')
+    compiled = CompiledMarker(marker, interval=4)
+    for _ in range(12):
+        assert compiled.evaluate({}, context="requirement") is False
+    # The extra check is moved first but doesn't raise on missing extras
+    first = compiled._root.children[0]  # type: ignore[attr-defined]
+    assert first.marker == parse_marker('extra == "foo"')
+    with pytest.raises(KeyError):
+        marker.evaluate({"python_full_version": "2.7.18"}, context="requirement")
+    with pytest.raises(KeyError):
+        compiled.evaluate({"python_full_version": "2.7.18"}, context="requirement")
+
+
+def test_compiled_marker_fallback_does_not_record_statistics() -> None:
+    from dep_logic.markers import CompiledMarker
+
+    marker = parse_marker(
+        'sys_platform == "linux" and python_full_version < "3.0" and extra == "foo"',
+        lazy=True,
+    )
+    compiled = CompiledMarker(marker, interval=3)
+    env: dict[str, str | set[str]] = {
+        "sys_platform": "linux",
+        "python_full_version": "3.12.0",
+    }
+    for _ in range(3):
+        assert compiled.evaluate(env, context="requirement") is False
+    platform, extra, python = compiled._root.children  # type: ignore[attr-defined]
+    assert extra.marker == parse_marker('extra == "foo"')
+    # The extra check fails after the platform check ran, the declaration order
+    # is evaluated again without counting the platform check twice
+    assert compiled.evaluate(env, context="requirement") is False
+    assert (platform.calls, platform.hits) == (4, 4)
+    assert (python.calls, python.hits) == (3, 0)
+    assert (extra.calls, extra.hits) == (0, 0)
+
+
+@pytest.mark.parametrize(
+    "marker_string",
+    [
+        'python_version >= "3.6" and (extra == "foo" or extra == "bar")',
+        'sys_platform == "win32" or os_name == "nt" and python_version < "3.0"',
+        '"foo" in extras or "dev" in dependency_groups',
+    ],
+)
+@pytest.mark.parametrize(
+    "environment",
+    [
+        {"extra": "foo", "sys_platform": "linux"},
+        {"extra": ("bar", "baz"), "python_version": "3.5", "os_name": "nt"},
+        {
+            "sys_platform": "win32",
+            "extra": "",
+            "extras": {"Foo"},
+            "dependency_groups": set(),
+        },
+    ],
+)
+def test_lazy_marker_evaluate(
+    marker_string: str, environment: dict[str, str | set[str]]
+) -> None:
+    lazy = parse_marker(marker_string, lazy=True)
+    assert lazy.evaluate(environment, context="lock_file") is parse_marker(
+        marker_string
+    ).evaluate(environment, context="lock_file")
+    assert lazy._marker is None  # type: ignore[attr-defined]
+
+
+def test_lazy_marker_logic_operations() -> None:
+    source = 'python_version >= "3.6" and sys_platform == "linux"'
+    lazy = parse_marker(source, lazy=True)
+    eager = parse_marker(source)
+    other = parse_marker('python_version < "3.8" or os_name == "nt"')
+
+    assert lazy == eager
+    assert hash(lazy) == hash(eager)
+    assert str(lazy) == str(eager)
+    assert lazy & other == eager & other
+    assert other & lazy == other & eager
+    assert lazy | other == eager | other
+    assert other | lazy == other | eager
+    assert "LazyMarker" not in repr(other | lazy)
+
+
+def test_compiled_marker_reorders_by_selectivity() -> None:
+    from dep_logic.markers import CompiledMarker
+
+    marker = parse_marker('python_full_version >= "3.8.0" and sys_platform == "win32"')
+    compiled = CompiledMarker(marker, interval=4)
+    environments: list[dict[str, str | set[str]]] = [
+        {"python_full_version": "3.9.1", "sys_platform": "linux"},
+        {"python_full_version": "3.7.1", "sys_platform": "linux"},
+        {"python_full_version": "3.12.0", "sys_platform": "win32"},
+    ]
+    for _ in range(4):
+        for env in environments:
+            assert compiled.evaluate(env) is marker.evaluate(env)
+    # The cheap and selective sys_platform check is moved to the front
+    first = compiled._root.children[0]  # type: ignore[attr-defined]
+    assert first.marker == parse_marker('sys_platform == "win32"')
+
+
+@pytest.mark.parametrize(
+    "marker_string",
+    [
+        'python_version >= "3.6" and (extra == "foo" or extra == "bar")',
+        'sys_platform == "win32" or os_name == "nt" and python_version < "3.0"',
+    ],
+)
+@pytest.mark.parametrize("lazy", [True, False])
+def test_compiled_marker_evaluate(marker_string: str, lazy: bool) -> None:
+    from dep_logic.markers import CompiledMarker
+
+    marker = parse_marker(marker_string, lazy=lazy)
+    compiled = CompiledMarker(marker, interval=1)
+    environments: list[dict[str, str | set[str]]] = [
+        {"extra": "foo", "sys_platform": "linux"},
+        {"extra": "bar", "python_version": "3.5", "os_name": "nt"},
+        {"sys_platform": "win32", "python_version": "2.7"},
+    ]
+    for env in environments * 3:
+        assert compiled.evaluate(env) is marker.evaluate(env)
+
+
+@pytest.mark.parametrize(
+    "marker,expected",
+    [
+        (MarkerExpression("extra", "==", "Foo.Bar"), True),
+        (MarkerExpression("extra", "!=", "Foo.Bar"), False),
+        (MarkerExpression("extras", "in", "Foo_Bar", reversed=True), True),
+        (MarkerExpression("dependency_groups", "in", "Dev", reversed=True), False),
+    ],
+)
+def test_evaluate_unnormalized_extra_expression(
+    marker: MarkerExpression, expected: bool
+) -> None:
+    environment: dict[str, str | set[str]] = {
+        "extra": {"foo-bar", "docs"},
+        "extras": {"FOO.BAR"},
+        "dependency_groups": {"test"},
+    }
+    assert marker.evaluate(environment) is expected
+
+
+@pytest.mark.parametrize(
+    "marker_string",
+    [
+        '"dev" in dependency_groups',
+        'sys_platform == "linux" and "Test" in dependency_groups',
+        'sys_platform == "win32" and "test" in dependency_groups or "docs" in extras',
+        '"dev" not in dependency_groups and python_version >= "3.8"',
+        'python_version < "3.8" or "foo" in extras and "bar" not in extras',
+    ],
+)
+@pytest.mark.parametrize("lazy", [True, False])
+def test_group_selection_evaluator(marker_string: str, lazy: bool) -> None:
+    from dep_logic.markers import GroupSelectionEvaluator
+
+    environment = {"sys_platform": "linux", "python_version": "3.11"}
+    evaluator = GroupSelectionEvaluator(environment)
+    marker = parse_marker(marker_string, lazy=lazy)
+    selections: list[tuple[set[str], set[str]]] = [
+        (set(), set()),
+        ({"Foo"}, {"dev"}),
+        ({"foo", "bar"}, {"test", "docs"}),
+        ({"docs"}, {"TEST"}),
+    ]
+    for extras, groups in selections * 2:
+        expected = marker.evaluate(
+            {**environment, "extras": extras, "dependency_groups": groups},
+            context="lock_file",
+        )
+        assert evaluator.evaluate(marker, extras, groups) is expected
+
+
+def test_group_selection_evaluator_split() -> None:
+    from dep_logic.markers import GroupSelectionEvaluator
+
+    evaluator = GroupSelectionEvaluator({"sys_platform": "linux"})
+    marker = parse_marker(
+        'sys_platform == "linux" and "dev" in dependency_groups'
+        ' or sys_platform == "win32" and "docs" in extras'
+    )
+    split = evaluator.split(marker)
+    assert str(split.marker) == '"dev" in dependency_groups'
+    assert split.extras == frozenset()
+    assert split.dependency_groups == frozenset({"dev"})
+    assert evaluator.split(parse_marker('sys_platform == "win32"')).marker.is_empty()
+
+
+def test_subclass_overriding_evaluate_only() -> None:
+    from dep_logic.markers.base import BaseMarker
+
+    class PlatformMarker(BaseMarker):
+        def __and__(self, other):
+            return MultiMarker(self, other)
+
+        def __or__(self, other):
+            return MarkerUnion(self, other)
+
+        def __str__(self) -> str:
+            return "custom"
+
+        def evaluate(self, environment=None, context="metadata"):
+            return (environment or {}).get("sys_platform") == "linux"
+
+        def without_extras(self):
+            return self
+
+        def exclude(self, marker_name):
+            return self
+
+        def only(self, *marker_names):
+            return self
+
+    marker = PlatformMarker()
+    assert marker.evaluate({"sys_platform": "linux"})
+    combined = MultiMarker(parse_marker('os_name == "posix"'), marker)
+    assert combined.evaluate({"os_name": "posix", "sys_platform": "linux"})
+    assert not combined.evaluate({"os_name": "posix", "sys_platform": "win32"})
@@ -2,7 +2,7 @@ import itertools
 
 import pytest
 
-from dep_logic.markers import InvalidMarker, parse_marker
+from dep_logic.markers import InvalidMarker, from_pkg_marker, parse_marker
 
 VARIABLES = [
     "extra",
@@ -81,3 +81,49 @@ def test_parses_invalid(marker_string: str):
 )
 def test_parses_pep345_valid(marker_string: str) -> None:
     parse_marker(marker_string)
+
+
+@pytest.mark.parametrize(
+    "marker_string,expected",
+    [
+        ("os.name == 'nt'", 'os_name == "nt"'),
+        (
+            "python_implementation == 'CPython'",
+            'platform_python_implementation == "CPython"',
+        ),
+        ("extra == 'Foo.Bar'", 'extra == "foo-bar"'),
+        ("'Foo_Bar' in extras", '"foo-bar" in extras'),
+        ("'3.8' < python_version", '"3.8" < python_version'),
+        (
+            "(os_name=='nt'or sys_platform=='win32')and python_version>='3.8'",
+            'os_name == "nt" and python_version >= "3.8" or '
+            'sys_platform == "win32" and python_version >= "3.8"',
+        ),
+    ],
+)
+def test_parse_normalization(marker_string: str, expected: str) -> None:
+    assert str(parse_marker(marker_string)) == expected
+
+
+@pytest.mark.parametrize(
+    "marker_string,message",
+    [
+        ("python_version", "Expected marker operator"),
+        ("'3.8' == '3.8'", "Expected a marker variable compared with a quoted string"),
+        ("os_name == 'nt' and", "Expected a marker variable or quoted string"),
+        ("(os_name == 'nt'", "Expected matching right parenthesis"),
+        ("os_name == 'nt' with", "Expected end of marker expression"),
+    ],
+)
+def test_parse_error_message(marker_string: str, message: str) -> None:
+    with pytest.raises(InvalidMarker, match=message):
+        parse_marker(marker_string)
+
+
+def test_from_pkg_marker() -> None:
+    from packaging.markers import Marker
+
+    marker = Marker('python_version >= "3.8" and extra == "Foo"')
+    assert from_pkg_marker(marker) == parse_marker(
+        'python_version >= "3.8" and extra == "foo"'
+    )
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from dep_logic.markers import BaseMarker, parse_marker, partition
+from dep_logic.markers.union import MarkerUnion
+
+ENVIRONMENTS = [
+    {
+        "python_version": ".".join(full.split(".")[:2]),
+        "python_full_version": full,
+        "sys_platform": platform,
+        "implementation_name": implementation,
+        "platform_release": release,
+    }
+    for full, platform, implementation, release in itertools.product(
+        ["2.7.18", "3.7.1", "3.8.0", "3.8.5", "3.10.1", "3.11.2", "3.12.0"],
+        ["linux", "win32", "darwin"],
+        ["cpython", "pypy"],
+        ["4.19", "5.10"],
+    )
+]
+
+
+@pytest.mark.parametrize(
+    "markers",
+    [
+        ['python_version >= "3.8"'],
+        ['python_version >= "3.8"', 'python_full_version < "3.10.1"'],
+        [
+            'python_version >= "3.8" and sys_platform == "win32"',
+            'python_full_version < "3.11.2" or sys_platform == "linux"',
+            'implementation_name == "pypy" and python_version < "3.9"',
+        ],
+        [
+            'sys_platform == "win32" or sys_platform == "darwin"',
+            'sys_platform != "linux"',
+        ],
+        ['platform_release >= "5" and python_version > "3.7"'],
+        ['"linux" in sys_platform and extra == "foo"'],
+    ],
+)
+def test_partition(markers: list[str]) -> None:
+    parsed = [parse_marker(m) for m in markers]
+    regions = partition(parsed)
+
+    values: dict[int, tuple[bool, ...]] = {}
+    for env in ENVIRONMENTS:
+        matched = [i for i, region in enumerate(regions) if region.evaluate(env)]
+        assert len(matched) == 1, env
+        result = tuple(m.evaluate({**env, "extra": "foo"}) for m in parsed)
+        assert values.setdefault(matched[0], result) == result
+
+
+def test_partition_merges_uniform_regions() -> None:
+    regions = partition(
+        [
+            parse_marker('python_version >= "3.8" and sys_platform == "win32"'),
+            parse_marker('python_version >= "3.8" or sys_platform == "win32"'),
+        ]
+    )
+
+    assert sorted(map(str, regions)) == [
+        'python_version < "3.8" and sys_platform != "win32"',
+        'python_version < "3.8" and sys_platform == "win32" or '
+        'python_version >= "3.8" and sys_platform != "win32"',
+        'python_version >= "3.8" and sys_platform == "win32"',
+    ]
+
+
+def test_partition_drops_variables_not_deciding_a_region() -> None:
+    regions = partition(
+        [
+            parse_marker('sys_platform == "win32" and python_version >= "3.9"'),
+            parse_marker('python_version < "3.9"'),
+        ]
+    )
+
+    assert sorted(map(str, regions)) == [
+        'python_version < "3.9"',
+        'sys_platform != "win32" and python_version >= "3.9"',
+        'sys_platform == "win32" and python_version >= "3.9"',
+    ]
+
+
+def test_partition_regions_are_factored() -> None:
+    regions = partition(
+        [
+            parse_marker('python_version >= "3.8" and sys_platform == "win32"'),
+            parse_marker('python_version >= "3.8" and implementation_name == "pypy"'),
+        ]
+    )
+
+    assert sorted(map(str, regions)) == [
+        'python_version < "3.8" or python_version >= "3.8" and '
+        'sys_platform != "win32" and implementation_name != "pypy"',
+        'python_version >= "3.8" and sys_platform != "win32" and '
+        'implementation_name == "pypy"',
+        'python_version >= "3.8" and sys_platform == "win32" and '
+        'implementation_name != "pypy"',
+        'python_version >= "3.8" and sys_platform == "win32" and '
+        'implementation_name == "pypy"',
+    ]
+
+
+def test_partition_without_environment_markers() -> None:
+    assert [str(r) for r in partition([parse_marker('extra == "foo"')])] == [""]
+    assert [str(r) for r in partition([])] == [""]
+
+
+def test_partition_cost_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    markers = [
+        'python_version >= "3.8" and sys_platform == "win32"',
+        'python_full_version < "3.11.2" or sys_platform == "linux"',
+        'implementation_name == "pypy" and python_version < "3.9"',
+        'platform_machine == "x86_64" or os_name == "nt"',
+        'platform_release >= "5" and python_version < "3.12"',
+    ]
+    parsed = [parse_marker(m) for m in markers]
+    union_sizes: list[int] = []
+    union_of = MarkerUnion.of.__func__  # type: ignore[attr-defined]
+
+    def counting_of(cls: type[MarkerUnion], *markers: BaseMarker) -> BaseMarker:
+        union_sizes.append(len(markers))
+        return union_of(cls, *markers)
+
+    monkeypatch.setattr(MarkerUnion, "of", classmethod(counting_of))
+    regions = partition(parsed)
+
+    # Only the few cells of one variable are simplified together
+    assert max(union_sizes) <= 5
+    assert len(union_sizes) < 50
+    for env in ENVIRONMENTS:
+        env = {**env, "platform_machine": "x86_64", "os_name": "posix"}
+        matched = [region for region in regions if region.evaluate(env)]
+        assert len(matched) == 1, env
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pytest
+
+from dep_logic.markers import MarkerPool, parse_marker
+
+SHARED = 'python_version >= "3.9" and sys_platform != "win32"'
+
+
+def test_pool_shares_subtrees() -> None:
+    pool = MarkerPool()
+    m1 = pool.add(parse_marker(f'{SHARED} and platform_machine == "x86_64"'))
+    m2 = pool.add(parse_marker(f'({SHARED}) or implementation_name == "pypy"'))
+    m3 = pool.add(parse_marker(f'{SHARED} and platform_machine == "x86_64"'))
+
+    assert m1 is m3
+    assert str(m1) == f'{SHARED} and platform_machine == "x86_64"'
+    shared = {id(m) for m in m1.markers} & {id(m) for m in m2.markers[0].markers}
+    assert len(shared) == 2
+    # 4 + 5 + 4 nodes visited, 7 distinct nodes
+    assert len(pool) == 7
+    assert pool.dedup_ratio == 13 / 7
+
+
+def test_pool_release() -> None:
+    pool = MarkerPool()
+    m1 = pool.add(parse_marker(f'{SHARED} and platform_machine == "x86_64"'))
+    m2 = pool.add(parse_marker(SHARED))
+    pool.release(m1)
+
+    assert m1 not in pool
+    assert m2 in pool
+    assert len(pool) == 3
+    pool.release(m2)
+    assert len(pool) == 0
+    with pytest.raises(ValueError):
+        pool.release(m2)
+
+
+def test_pool_memoizes_operations() -> None:
+    pool = MarkerPool()
+    m1 = pool.add(parse_marker(SHARED))
+    m2 = pool.add(parse_marker('platform_machine == "x86_64"'))
+
+    result = pool.intersect(m1, m2)
+    assert str(result) == f'{SHARED} and platform_machine == "x86_64"'
+    assert pool.intersect(m1, m2) is result
+    assert pool.union(m1, m2) is not result
+    assert result.markers[0] is m1.markers[0]
+
+    pool.release(result)
+    pool.release(result)
+    assert result not in pool
+    new_result = pool.intersect(m1, m2)
+    assert new_result == result
+    assert new_result in pool
+
+    with pytest.raises(ValueError):
+        pool.intersect(m1, parse_marker('os_name == "nt"'))
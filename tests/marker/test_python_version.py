@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pytest
+
+from dep_logic.markers import PythonVersionSet, parse_marker
+
+
+@pytest.mark.parametrize(
+    "marker",
+    [
+        'python_version >= "3.8"',
+        'python_version < "3.8"',
+        'python_version == "3.8"',
+        'python_version != "3.8"',
+        'python_version ~= "3.8"',
+        'python_full_version == "3.8.1"',
+        'python_full_version != "3.8.1"',
+        'python_full_version > "3.8.1"',
+        'python_full_version <= "3.8.1"',
+        'python_full_version ~= "3.8.1"',
+        'python_version >= "3.8" and python_full_version < "3.11.2"',
+        'python_version < "3.6" or python_version >= "3.8"',
+        'python_version != "3.8" and python_full_version != "3.9.1"',
+    ],
+)
+def test_python_version_set_round_trip(marker: str) -> None:
+    version_set = PythonVersionSet.from_marker(parse_marker(marker))
+    assert version_set is not None
+    assert str(version_set.to_marker()) == marker
+
+
+@pytest.mark.parametrize(
+    "marker,normalized",
+    [
+        ('python_version > "3.8"', 'python_version >= "3.9"'),
+        ('python_version <= "3.8"', 'python_version < "3.9"'),
+        ('python_full_version >= "3.8"', 'python_version >= "3.8"'),
+        ('python_full_version == "3.8.*"', 'python_version == "3.8"'),
+        (
+            'python_version != "3.*"',
+            'python_version < "3.0" or python_version >= "4.0"',
+        ),
+    ],
+)
+def test_python_version_set_normalizes(marker: str, normalized: str) -> None:
+    version_set = PythonVersionSet.from_marker(parse_marker(marker))
+    assert version_set is not None
+    assert str(version_set) == normalized
+
+
+@pytest.mark.parametrize(
+    "marker",
+    [
+        'python_version in "3.8, 3.9"',
+        'python_full_version == "3.13.0rc1"',
+        'python_version >= "3.8.1"',
+        'python_version >= "3.8" and sys_platform == "win32"',
+    ],
+)
+def test_python_version_set_unsupported(marker: str) -> None:
+    assert PythonVersionSet.from_marker(parse_marker(marker)) is None
+
+
+def test_python_version_set_operations() -> None:
+    ge38 = PythonVersionSet.from_marker(parse_marker('python_version >= "3.8"'))
+    lt311 = PythonVersionSet.from_marker(parse_marker('python_version < "3.11"'))
+    assert ge38 is not None and lt311 is not None
+    assert str(ge38 & lt311) == 'python_version >= "3.8" and python_version < "3.11"'
+    assert (ge38 | lt311).is_any()
+    assert (ge38 & ~ge38).is_empty()
+    assert ~~ge38 == ge38
+    assert not (ge38 & lt311).is_compound()
+    assert not (~(ge38 & lt311)).is_compound()
+    lt36 = PythonVersionSet.from_marker(parse_marker('python_version < "3.6"'))
+    assert lt36 is not None
+    assert (ge38 & lt311 | lt36).is_compound()
+
+
+@pytest.mark.parametrize(
+    "marker",
+    [
+        'python_version >= "3.8" and python_full_version < "3.11.2"',
+        'python_version != "3.9" and python_full_version != "3.8.1"',
+        'python_version < "3.6" or python_full_version > "3.10.1"',
+    ],
+)
+@pytest.mark.parametrize(
+    "version", ["2.7.18", "3.6.0", "3.8.0", "3.8.1", "3.9.5", "3.10.1", "3.11.2"]
+)
+def test_python_version_set_contains(marker: str, version: str) -> None:
+    parsed = parse_marker(marker)
+    version_set = PythonVersionSet.from_marker(parsed)
+    assert version_set is not None
+    environment = {
+        "python_version": ".".join(version.split(".")[:2]),
+        "python_full_version": version,
+    }
+    assert (version in version_set) is parsed.evaluate(environment)
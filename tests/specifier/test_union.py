@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 from packaging.version import Version
 
@@ -96,3 +98,17 @@ def test_union_intesection(a: str, b: str, expected: str) -> None:
 )
 def test_union_union(a: str, b: str, expected: str) -> None:
     assert str(parse_version_specifier(a) | parse_version_specifier(b)) == expected
+
+
+@pytest.mark.parametrize("spec", ["", ">=3.8", "==3.8.*", "<3.6||>=3.8", "!=3.8.*"])
+def test_pickle(spec: str) -> None:
+    parsed = (
+        parse_version_specifier("<3.6") | parse_version_specifier(">=3.8")
+        if spec == "<3.6||>=3.8"
+        else parse_version_specifier(spec)
+    )
+
+    restored = pickle.loads(pickle.dumps(parsed))
+    assert restored == parsed
+    assert str(restored) == str(parsed)
+    assert type(restored) is type(parsed)
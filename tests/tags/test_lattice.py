@@ -0,0 +1,118 @@
+import pytest
+
+from dep_logic.tags import EnvSpec, EnvSpecSet
+
+TARGETS = [
+    EnvSpec.from_spec(">=3.9", "macos_14_0_arm64", "cpython"),
+    EnvSpec.from_spec(">=3.9", "macos_12_0_arm64", "cpython"),
+    EnvSpec.from_spec(">=3.10", "macos_11_0_arm64", "cpython"),
+    EnvSpec.from_spec(">=3.9", "macos_12_0_x86_64", "cpython"),
+    EnvSpec.from_spec(">=3.9", "manylinux_2_17_x86_64", "cpython"),
+    EnvSpec.from_spec(">=3.9", "manylinux_2_28_x86_64", "cpython"),
+    EnvSpec.from_spec(">=3.8", "manylinux_2_28_x86_64", "cpython"),
+    EnvSpec.from_spec(">=3.8,<4", "manylinux_2_28_x86_64", "cpython"),
+    EnvSpec.from_spec(">=3.9", "manylinux_2_17_x86_64", "pypy"),
+    EnvSpec.from_spec(">=3.9", "windows", "cpython"),
+    EnvSpec.from_spec(">=3.11", "windows", "cpython"),
+    EnvSpec.from_spec(">=3.9"),
+    EnvSpec.from_spec(">=3.12"),
+]
+
+
+def test_covers():
+    assert EnvSpecSet.covers(TARGETS[1], TARGETS[0])
+    assert not EnvSpecSet.covers(TARGETS[0], TARGETS[1])
+    # Python 3.9 is not covered by >=3.10
+    assert not EnvSpecSet.covers(TARGETS[2], TARGETS[0])
+    # Different arch
+    assert not EnvSpecSet.covers(TARGETS[3], TARGETS[0])
+    # Different implementation
+    assert not EnvSpecSet.covers(TARGETS[4], TARGETS[8])
+    assert EnvSpecSet.covers(TARGETS[9], TARGETS[10])
+    assert EnvSpecSet.covers(TARGETS[11], TARGETS[12])
+
+
+GENERIC_TARGETS = [
+    EnvSpec.from_spec(">=3.8", implementation="cpython"),
+    EnvSpec.from_spec(">=3.9", "manylinux_2_17_x86_64"),
+    EnvSpec.from_spec(">=3.10", "macos_12_0_arm64"),
+]
+
+
+@pytest.mark.parametrize("spec", TARGETS + GENERIC_TARGETS)
+def test_covering_and_covered(spec):
+    env_set = EnvSpecSet(TARGETS + GENERIC_TARGETS)
+    assert set(env_set.covering(spec)) == {
+        t for t in env_set if EnvSpecSet.covers(t, spec)
+    }
+    assert set(env_set.covered(spec)) == {
+        t for t in env_set if EnvSpecSet.covers(spec, t)
+    }
+
+
+def test_minimal_cover():
+    env_set = EnvSpecSet(TARGETS[:11])
+    assert env_set.minimal_cover() == [
+        TARGETS[1],
+        TARGETS[2],
+        TARGETS[3],
+        TARGETS[4],
+        TARGETS[6],
+        TARGETS[8],
+        TARGETS[9],
+    ]
+
+
+def test_generic_targets_cover_specific_ones():
+    any_platform = EnvSpec.from_spec(">=3.9", implementation="cpython")
+    any_implementation = EnvSpec.from_spec(">=3.9", "manylinux_2_17_x86_64")
+    for spec in (TARGETS[11], any_platform):
+        assert EnvSpecSet.covers(spec, TARGETS[0])
+        assert not EnvSpecSet.covers(TARGETS[0], spec)
+    assert not EnvSpecSet.covers(any_platform, TARGETS[8])
+    assert EnvSpecSet.covers(any_implementation, TARGETS[5])
+    assert EnvSpecSet.covers(any_implementation, TARGETS[8])
+    assert not EnvSpecSet.covers(any_implementation, TARGETS[0])
+    assert not EnvSpecSet.covers(any_implementation, any_platform)
+    # Python 3.8 is not covered by >=3.9
+    assert not EnvSpecSet.covers(TARGETS[11], TARGETS[6])
+
+    env_set = EnvSpecSet([*TARGETS, any_platform, any_implementation])
+    assert set(env_set.covering(TARGETS[5])) == {
+        TARGETS[4],
+        TARGETS[5],
+        TARGETS[6],
+        TARGETS[11],
+        any_platform,
+        any_implementation,
+    }
+    assert set(env_set.covered(any_implementation)) == {
+        TARGETS[4],
+        TARGETS[5],
+        TARGETS[8],
+        any_implementation,
+    }
+
+
+def test_minimal_cover_with_generic_targets():
+    assert EnvSpecSet(TARGETS).minimal_cover() == [TARGETS[6], TARGETS[11]]
+    any_platform = EnvSpec.from_spec(">=3.8", implementation="cpython")
+    env_set = EnvSpecSet([*TARGETS[:11], any_platform])
+    assert env_set.minimal_cover() == [TARGETS[8], any_platform]
+
+
+def test_equal_targets_are_deduplicated():
+    env_set = EnvSpecSet([*TARGETS, *TARGETS])
+    assert len(env_set) == len(TARGETS)
+    assert env_set.minimal_cover() == EnvSpecSet(TARGETS).minimal_cover()
+
+
+@pytest.mark.parametrize("targets", [TARGETS[:11], TARGETS + GENERIC_TARGETS])
+def test_minimal_cover_covers_all_targets(targets):
+    cover = EnvSpecSet(targets).minimal_cover()
+    for spec in targets:
+        assert any(EnvSpecSet.covers(kept, spec) for kept in cover)
+    for kept in cover:
+        assert not any(
+            EnvSpecSet.covers(other, kept) for other in cover if other is not kept
+        )
@@ -0,0 +1,55 @@
+import pytest
+
+from dep_logic.tags import EnvSpec, InvalidWheelFilename, WheelCompatMatrix
+
+TARGETS = [
+    EnvSpec.from_spec(">=3.9", "linux", "cpython"),
+    EnvSpec.from_spec(">=3.12", "linux", "cpython"),
+    EnvSpec.from_spec(">=3.9", "manylinux_2_17_aarch64", "cpython"),
+    EnvSpec.from_spec(">=3.9", "windows", "cpython"),
+    EnvSpec.from_spec(">=3.9", "windows_x86", "cpython"),
+    EnvSpec.from_spec(">=3.9", "macos", "cpython"),
+    EnvSpec.from_spec(">=3.13", "macos", "cpython", True),
+    EnvSpec.from_spec(">=3.9", "alpine", "pypy"),
+    EnvSpec.from_spec(">=3.10"),
+    EnvSpec.from_spec("<3.9", "linux"),
+]
+
+WHEELS = [
+    "protobuf-5.27.2-cp313-cp313t-macosx_14_0_arm64.whl",
+    "protobuf-5.27.2-cp313-cp313-macosx_14_0_arm64.whl",
+    "protobuf-5.27.2-cp310-abi3-win32.whl",
+    "protobuf-5.27.2-cp310-abi3-win_amd64.whl",
+    "protobuf-5.27.2-cp38-abi3-macosx_10_9_universal2.whl",
+    "protobuf-5.27.2-cp38-abi3-manylinux2014_aarch64.whl",
+    "protobuf-5.27.2-cp38-abi3-manylinux2014_x86_64.whl",
+    "protobuf-5.27.2-cp39-cp39-win32.whl",
+    "grpcio-1.66.1-cp312-cp312-manylinux_2_17_x86_64.manylinux2014_x86_64.whl",
+    "grpcio-1.66.1-cp312-cp312-musllinux_1_1_x86_64.whl",
+    "grpcio-1.66.1-pp310-pypy310_pp73-musllinux_1_1_x86_64.whl",
+    "six-1.16.0-py2.py3-none-any.whl",
+]
+
+
+@pytest.mark.parametrize("wheel", WHEELS)
+def test_matrix_matches_env_specs(wheel):
+    matrix = WheelCompatMatrix(TARGETS)
+    expected = {
+        spec: compat
+        for spec in TARGETS
+        if (compat := spec.wheel_compatibility(wheel)) is not None
+    }
+
+    assert matrix.compatibility(wheel) == expected
+    assert list(matrix.compatibility(wheel)) == list(expected)
+
+
+def test_matrix_deduplicates_targets():
+    matrix = WheelCompatMatrix([*TARGETS, *TARGETS])
+    assert matrix.env_specs == tuple(TARGETS)
+
+
+def test_matrix_invalid_wheel():
+    matrix = WheelCompatMatrix(TARGETS)
+    with pytest.raises(InvalidWheelFilename):
+        matrix.compatibility("six-1.16.0.tar.gz")
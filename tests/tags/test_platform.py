@@ -6,7 +6,7 @@ from dep_logic.tags.platform import Arch, Platform
 
 def test_platform_tags_manylinux():
     tags = Platform(os.Manylinux(2, 20), Arch.X86_64).compatible_tags
-    assert tags == [
+    assert tags == (
         "manylinux_2_20_x86_64",
         "manylinux_2_19_x86_64",
         "manylinux_2_18_x86_64",
@@ -27,12 +27,12 @@ def test_platform_tags_manylinux():
         "manylinux_2_5_x86_64",
         "manylinux1_x86_64",
         "linux_x86_64",
-    ]
+    )
 
 
 def test_platform_tags_macos():
     tags = Platform(os.Macos(21, 6), Arch.X86_64).compatible_tags
-    assert tags == [
+    assert tags == (
         "macosx_21_0_x86_64",
         "macosx_21_0_intel",
         "macosx_21_0_fat64",
@@ -177,10 +177,10 @@ def test_platform_tags_macos():
         "macosx_10_4_fat32",
         "macosx_10_4_universal2",
         "macosx_10_4_universal",
-    ]
+    )
 
     tags = Platform(os.Macos(14, 0), Arch.X86_64).compatible_tags
-    assert tags == [
+    assert tags == (
         "macosx_14_0_x86_64",
         "macosx_14_0_intel",
         "macosx_14_0_fat64",
@@ -283,10 +283,10 @@ def test_platform_tags_macos():
         "macosx_10_4_fat32",
         "macosx_10_4_universal2",
         "macosx_10_4_universal",
-    ]
+    )
 
     tags = Platform(os.Macos(10, 6), Arch.X86_64).compatible_tags
-    assert tags == [
+    assert tags == (
         "macosx_10_6_x86_64",
         "macosx_10_6_intel",
         "macosx_10_6_fat64",
@@ -305,17 +305,17 @@ def test_platform_tags_macos():
         "macosx_10_4_fat32",
         "macosx_10_4_universal2",
         "macosx_10_4_universal",
-    ]
+    )
 
 
 def test_platform_tags_windows():
     tags = Platform(os.Windows(), Arch.X86_64).compatible_tags
-    assert tags == ["win_amd64"]
+    assert tags == ("win_amd64",)
 
 
 def test_platform_tags_musl():
     tags = Platform(os.Musllinux(1, 2), Arch.Aarch64).compatible_tags
-    assert tags == ["linux_aarch64", "musllinux_1_1_aarch64", "musllinux_1_2_aarch64"]
+    assert tags == ("linux_aarch64", "musllinux_1_1_aarch64", "musllinux_1_2_aarch64")
 
 
 @pytest.mark.parametrize(
@@ -1,7 +1,20 @@
+import pickle
+import platform as host_platform
+
 import pytest
 
-from dep_logic.tags import EnvSpec
-from dep_logic.tags.tags import EnvCompatibility
+from dep_logic.markers import parse_marker
+from dep_logic.specifiers import parse_version_specifier
+from dep_logic.tags import (
+    EnvSpec,
+    InvalidWheelFilename,
+    Platform,
+    filter_targets,
+    refresh_current,
+)
+from dep_logic.tags.os import Illumos
+from dep_logic.tags.platform import Arch
+from dep_logic.tags.tags import EnvCompatibility, WheelTags, parse_wheel_tags
 
 
 def test_check_wheel_tags():
@@ -153,3 +166,234 @@ def test_check_wheel_tags():
 )
 def test_env_spec_comparison(left, right, expected):
     assert left.compare(right) == expected
+
+
+@pytest.mark.parametrize("platform", ["linux", "windows", "macos", "alpine"])
+def test_platform_tag_priority(platform):
+    spec = EnvSpec.from_spec(">=3.9", platform)
+    assert spec.platform is not None
+    tags = [*spec.platform.compatible_tags, "any"]
+
+    for tag in tags:
+        assert spec._evaluate_platform(tag) == len(tags) - tags.index(tag)
+    assert spec._evaluate_platform("any") == 1
+    assert spec._evaluate_platform("unknown_platform") is None
+
+
+RANKED_WHEELS = [
+    "grpcio-1.66.1-cp312-cp312-win_amd64.whl",
+    "grpcio-1.66.1-cp312-cp312-manylinux_2_17_x86_64.manylinux2014_x86_64.whl",
+    "grpcio-1.66.1-cp311-cp311-manylinux_2_17_x86_64.manylinux2014_x86_64.whl",
+    "grpcio-1.66.1-cp312-cp312-musllinux_1_1_x86_64.whl",
+    "grpcio-1.66.1-cp312-cp312-macosx_10_9_universal2.whl",
+    "grpcio-1.66.1-cp38-abi3-manylinux2014_x86_64.whl",
+    "grpcio-1.66.1-py3-none-any.whl",
+    "grpcio-1.66.1.tar.gz",
+]
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        EnvSpec.from_spec(">=3.11", "linux", "cpython"),
+        EnvSpec.from_spec(">=3.8", "windows", "cpython"),
+        EnvSpec.from_spec(">=3.12", "alpine", "cpython"),
+        EnvSpec.from_spec(">=3.9", "macos", "pypy"),
+        EnvSpec.from_spec(">=3.9"),
+    ],
+)
+def test_rank_wheels(spec):
+    compats = {
+        f: c
+        for f in RANKED_WHEELS
+        if f.endswith(".whl") and (c := spec.wheel_compatibility(f)) is not None
+    }
+    expected = sorted(compats, key=compats.__getitem__, reverse=True)
+
+    assert spec.rank(RANKED_WHEELS) == expected
+    assert spec.rank(iter(RANKED_WHEELS), limit=2) == expected[:2]
+    assert spec.select_best(RANKED_WHEELS) == (expected[0] if expected else None)
+
+
+def test_rank_wheels_linux():
+    spec = EnvSpec.from_spec(">=3.12", "linux", "cpython")
+    assert spec.rank(RANKED_WHEELS) == [
+        "grpcio-1.66.1-cp312-cp312-manylinux_2_17_x86_64.manylinux2014_x86_64.whl",
+        "grpcio-1.66.1-cp38-abi3-manylinux2014_x86_64.whl",
+        "grpcio-1.66.1-py3-none-any.whl",
+    ]
+    assert EnvSpec.from_spec("<3", "linux").select_best(RANKED_WHEELS) is None
+
+
+def test_parse_wheel_tags():
+    tags = parse_wheel_tags("six-1.16.0-py2.py3-none-any.whl")
+    assert tags == WheelTags(("py2", "py3"), ("none",), ("any",))
+    assert tags is parse_wheel_tags("attrs-24.2.0-1-py2.py3-none-any.whl")
+    tags = parse_wheel_tags(
+        "numpy-2.1.1-cp312-cp312-manylinux_2_17_x86_64.manylinux2014_x86_64.whl"
+    )
+    assert tags.platform == ("manylinux_2_17_x86_64", "manylinux2014_x86_64")
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "six-1.16.0.tar.gz",
+        "six-1.16.0-py3-none.whl",
+        "-six-1.16.0-py3-none-any.whl",
+        "six_-1.16.0-py3-none-any.whl",
+        "six-1.16.0+-py3-none-any.whl",
+        "six-1.16.0-build-py3-none-any.whl",
+        "six-1.16.0-py3.-none-any.whl",
+        "six-1.16.0-py3-none-any+.whl",
+    ],
+)
+def test_parse_invalid_wheel_filename(filename):
+    with pytest.raises(InvalidWheelFilename):
+        parse_wheel_tags(filename)
+
+
+def test_platforms_are_interned():
+    platform = Platform.parse("manylinux_2_28_x86_64")
+    assert Platform.parse("manylinux_2_28_x86_64") is platform
+    assert (
+        platform.compatible_tags
+        is Platform.parse("manylinux_2_28_x86_64").compatible_tags
+    )
+    assert Platform.parse("manylinux_2_28_aarch64") is not platform
+
+
+def test_python_tag_evaluation_is_cached():
+    spec = EnvSpec.from_spec(">=3.9", "linux", "cpython")
+    wheel = "foo-1.0-cp39-abi3-manylinux2014_x86_64.whl"
+    assert spec.wheel_compatibility(wheel) == spec.wheel_compatibility(wheel)
+    assert spec._python_results == {("cp39", "abi3"): (3, 9, 1)}
+    assert spec == EnvSpec.from_spec(">=3.9", "linux", "cpython")
+
+
+def test_pickle_env_spec():
+    spec = EnvSpec.from_spec(">=3.8", "macos_14_0_arm64", "cpython")
+    assert spec.platform is not None
+    spec.platform.compatible_tags
+
+    payload = pickle.dumps(spec)
+    assert b"macosx_14_0_arm64" not in payload
+    restored = pickle.loads(payload)
+    assert restored == spec
+    assert restored.platform is spec.platform
+
+
+def test_current_env_spec_is_cached(monkeypatch):
+    current = EnvSpec.current()
+    assert EnvSpec.current() is current
+    assert current.platform is Platform.current()
+
+    detected = EnvSpec.from_spec("==3.12.0", "windows", "cpython")
+    monkeypatch.setattr(EnvSpec, "_detect_current", classmethod(lambda cls: detected))
+    assert EnvSpec.current() is current
+    refresh_current()
+    try:
+        assert EnvSpec.current() is detected
+    finally:
+        monkeypatch.undo()
+        refresh_current()
+    assert EnvSpec.current() == current
+
+
+@pytest.mark.parametrize(
+    "marker,expected",
+    [
+        ('sys_platform == "win32"', [True, False, False, True, True]),
+        (
+            'sys_platform == "win32" and python_version < "3.10"',
+            [True, False, False, True, True],
+        ),
+        ('python_version >= "3.12"', [True, True, False, True, True]),
+        ('python_version >= "3.13"', [True, True, False, True, False]),
+        ('python_full_version < "3.9.5"', [True, True, False, True, True]),
+        (
+            'platform_machine == "arm64" and platform_system == "Darwin"',
+            [False, False, True, True, False],
+        ),
+        ('implementation_name == "pypy"', [False, False, False, True, True]),
+        ('extra == "test" and os_name == "posix"', [False, True, True, True, False]),
+        ('platform_release >= "6"', [True] * 5),
+        ('python_version < "3.8"', [False] * 5),
+    ],
+)
+def test_satisfies_marker(marker, expected):
+    targets = [
+        EnvSpec.from_spec(">=3.9", "windows", "cpython"),
+        EnvSpec.from_spec(">=3.9", "manylinux_2_17_x86_64", "cpython"),
+        EnvSpec.from_spec("==3.11.4", "macos_14_0_arm64", "cpython"),
+        EnvSpec.from_spec(">=3.9"),
+        EnvSpec.from_spec(">=3.8.1,<3.13", "windows_arm64"),
+    ]
+    parsed = parse_marker(marker)
+    assert [target.satisfies(parsed) for target in targets] == expected
+    assert filter_targets(parse_marker(marker, lazy=True), targets) == [
+        target for target, value in zip(targets, expected) if value
+    ]
+
+
+def test_satisfies_does_not_use_host_release():
+    host = EnvSpec.current()
+    target = EnvSpec(host.requires_python, host.platform, host.implementation)
+    assert target.platform is not None and target.platform.is_current()
+    release = parse_marker(f'platform_release != "{host_platform.release()}"')
+    version = parse_marker(f'platform_version != "{host_platform.version()}"')
+    for marker in (release, version):
+        assert target.satisfies(marker)
+        assert target.evaluate_marker(marker) is None
+    assert target.satisfies(
+        parse_marker(f'platform_machine == "{target.platform.platform_machine}"')
+    )
+
+
+@pytest.mark.parametrize(
+    "platform",
+    [
+        Platform.parse("freebsd_13_x86_64"),
+        Platform.parse("openbsd_7_x86_64"),
+        Platform(Illumos("5.11", "i86pc"), Arch.X86_64),
+    ],
+)
+def test_satisfies_on_other_posix_platforms(platform):
+    target = EnvSpec(parse_version_specifier(">=3.9"), platform)
+    assert target.satisfies(parse_marker('sys_platform == "freebsd13"'))
+    assert target.satisfies(parse_marker('platform_system != "Linux"'))
+    assert target.satisfies(parse_marker('platform_machine == "amd64"'))
+    assert not target.satisfies(parse_marker('os_name == "nt"'))
+    assert target.evaluate_marker(parse_marker('sys_platform == "linux"')) is None
+    assert target.evaluate_marker(parse_marker('os_name == "posix"')) is True
+
+
+def test_satisfies_does_not_use_host_python():
+    target = EnvSpec.from_spec(">=2.7,<3")
+    assert target.satisfies(parse_marker('python_version == "2.7"'))
+    assert not target.satisfies(parse_marker('python_version >= "3"'))
+
+
+@pytest.mark.parametrize(
+    "marker,expected",
+    [
+        ("", [True, True, True]),
+        ('python_version >= "3.9"', [True, True, True]),
+        ('python_version >= "3.10"', [None, None, True]),
+        ('python_version < "3.9"', [False, False, False]),
+        ('sys_platform == "win32"', [True, None, False]),
+        ('sys_platform == "win32" and python_version < "3.9"', [False, False, False]),
+        ('sys_platform == "win32" or python_version >= "3.9"', [True, True, True]),
+        ('sys_platform == "win32" or python_version >= "3.11"', [True, None, True]),
+        ('python_full_version >= "3.11.2"', [None, None, True]),
+        ('implementation_name == "pypy"', [False, None, False]),
+    ],
+)
+def test_evaluate_marker(marker, expected):
+    targets = [
+        EnvSpec.from_spec(">=3.9", "windows", "cpython"),
+        EnvSpec.from_spec(">=3.9"),
+        EnvSpec.from_spec("==3.11.4", "macos_14_0_arm64", "cpython"),
+    ]
+    parsed = parse_marker(marker)
+    assert [target.evaluate_marker(parsed) for target in targets] == expected
@@ -0,0 +1,118 @@
+import pytest
+
+from dep_logic.markers import parse_marker
+from dep_logic.markers.multi import MultiMarker
+from dep_logic.markers.union import MarkerUnion
+from dep_logic.serialization import dumps, dumps_many, loads, loads_many
+from dep_logic.specifiers import (
+    AnySpecifier,
+    EmptySpecifier,
+    RangeSpecifier,
+    parse_version_specifier,
+)
+
+
+@pytest.mark.parametrize(
+    "marker",
+    [
+        "",
+        "<empty>",
+        'python_version >= "3.8"',
+        '"tegra" in platform_release',
+        '"a" in extras',
+        'sys_platform == "win32" or sys_platform == "linux"',
+        'sys_platform != "win32" and sys_platform != "linux"',
+        'python_version ~= "3.8" and (os_name == "nt" or extra == "test")',
+        'python_version < "3.8" or python_full_version >= "3.9.1" and '
+        'implementation_name == "cpython"',
+    ],
+)
+def test_marker_round_trip(marker: str) -> None:
+    m = parse_marker(marker)
+    result = loads(dumps(m))
+    assert type(result) is type(m)
+    assert result == m
+    assert str(result) == str(m)
+
+
+@pytest.mark.parametrize(
+    "specifier",
+    [
+        "",
+        ">=3.8",
+        ">=3.8,<3.10",
+        "==3.8.*",
+        "~=3.8",
+        "<3.6,>3.8",
+        "!=3.8.*",
+        "===foobar",
+        "<3.8||>=3.10",
+    ],
+)
+def test_specifier_round_trip(specifier: str) -> None:
+    if "||" in specifier:
+        left, right = specifier.split("||")
+        spec = parse_version_specifier(left) | parse_version_specifier(right)
+    elif specifier == "<3.6,>3.8":
+        spec = EmptySpecifier()
+    else:
+        spec = parse_version_specifier(specifier)
+    result = loads(dumps(spec))
+    assert type(result) is type(spec)
+    assert result == spec
+    assert str(result) == str(spec)
+
+
+def test_any_specifier_is_not_merged_with_equal_range() -> None:
+    any_spec, any_range = loads_many(dumps_many([AnySpecifier(), RangeSpecifier()]))
+    assert type(any_spec) is AnySpecifier
+    assert type(any_range) is RangeSpecifier
+
+
+def test_reversed_expression_is_preserved() -> None:
+    marker = parse_marker('"tegra" in platform_release')
+    result = loads(dumps(marker))
+    assert result.reversed
+    assert str(result) == '"tegra" in platform_release'
+
+
+def test_shared_subtrees_are_preserved() -> None:
+    common = parse_marker('sys_platform == "win32" or os_name == "nt"')
+    first = MultiMarker(parse_marker('python_version >= "3.8"'), common)
+    second = MultiMarker(common, parse_marker('extra == "test"'))
+    separate = len(dumps(first)) + len(dumps(second))
+    data = dumps_many([first, second])
+    assert len(data) < separate
+
+    decoded_first, decoded_second = loads_many(data)
+    assert decoded_first == first
+    assert decoded_second == second
+    assert decoded_first.markers[1] is decoded_second.markers[0]
+
+
+def test_decoding_does_not_simplify(monkeypatch: pytest.MonkeyPatch) -> None:
+    marker = parse_marker(
+        'python_version >= "3.8" and (sys_platform == "win32" or os_name == "nt")'
+    )
+    data = dumps(marker)
+
+    def fail(*markers):
+        raise AssertionError("should not be called")
+
+    monkeypatch.setattr(MultiMarker, "of", fail)
+    monkeypatch.setattr(MarkerUnion, "of", fail)
+    assert loads(data) == marker
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"XYZ\x01", b"DLG\x02\x00\x00\x00", b"DLG\x01\x01", b"DLG\x01\x00\x01\x7f"],
+)
+def test_invalid_data(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        loads(data)
+
+
+def test_trailing_data() -> None:
+    with pytest.raises(ValueError, match="Unexpected data"):
+        loads(dumps(parse_marker('os_name == "nt"')) + b"\x00")